@@ -4,13 +4,33 @@ Supports both PDF (page-based) and non-PDF (section-based) citations
 Includes verification, fuzzy matching, and deterministic confidence scoring
 """
 import json
-import re
-from dataclasses import dataclass, asdict, field
+import logging
+import os
+from collections import Counter
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
 from difflib import SequenceMatcher
-from typing import List, Optional, Dict, Any, Tuple
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 
+import orjson
 
-@dataclass
+try:
+    from rapidfuzz import fuzz
+except ImportError:  # Optional C extension; fall back to difflib sliding window
+    fuzz = None
+
+try:
+    import ahocorasick
+except ImportError:  # Optional; batch span search falls back to str.find per query
+    ahocorasick = None
+
+from ..parsers.parse_pool import get_parse_pool, shutdown_parse_pool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
 class CitationLocation:
     """Location information for a citation"""
     # For all documents
@@ -22,11 +42,20 @@ class CitationLocation:
     page: Optional[int] = None  # Page number (1-indexed)
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return {k: v for k, v in asdict(self).items() if v is not None}
-
-
-@dataclass
+        """Convert to dictionary (fields that are None are omitted)"""
+        d = {}
+        if self.section is not None:
+            d["section"] = self.section
+        if self.char_start is not None:
+            d["char_start"] = self.char_start
+        if self.char_end is not None:
+            d["char_end"] = self.char_end
+        if self.page is not None:
+            d["page"] = self.page
+        return d
+
+
+@dataclass(slots=True)
 class Citation:
     """Citation to source text in a document with verification"""
     doc_id: str
@@ -54,6 +83,45 @@ class Citation:
             "confidence_reasons": self.confidence_reasons
         }
 
+    def to_json_bytes(self) -> bytes:
+        """Serialize to JSON bytes in the to_dict() shape"""
+        return citations_to_json(self)
+
+
+@dataclass(slots=True)
+class _ConfidenceAccumulator:
+    """Running totals for the overall confidence, filled as citations stream by"""
+    weighted_sum: float = 0.0
+    total_weight: float = 0.0
+    count: int = 0
+    verified_count: int = 0
+
+    def add(self, citation: Citation) -> None:
+        """Fold one citation into the totals"""
+        # Verified citations get more weight
+        if citation.verified:
+            weight = 1.5
+            self.verified_count += 1
+        else:
+            weight = 1.0
+        self.weighted_sum += citation.confidence * weight
+        self.total_weight += weight
+        self.count += 1
+
+    def overall(self, parser_weight: float) -> float:
+        """Weighted average scaled by parser reliability, plus verification bonus"""
+        if not self.count:
+            return 0.0
+
+        avg_confidence = self.weighted_sum / self.total_weight if self.total_weight > 0 else 0.0
+        overall = avg_confidence * parser_weight
+
+        # Bonus for having multiple verified citations (up to +0.1)
+        verification_bonus = min(0.1, self.verified_count * 0.02)
+        overall += verification_bonus
+
+        return min(overall, 1.0)
+
 
 class CitationExtractor:
     """Extract citations from uploaded documents with verification and fuzzy matching"""
@@ -62,6 +130,10 @@ class CitationExtractor:
     MAX_CITATION_LENGTH = 500  # Maximum characters for a single citation
     MIN_CONFIDENCE_THRESHOLD = 0.5  # Minimum confidence for grounding
     FUZZY_MATCH_THRESHOLD = 0.85  # Minimum similarity ratio for fuzzy matches (0.0-1.0)
+    FUZZY_SEARCH_MARGIN = 200  # Max chars searched on each side of the claimed span
+    FUZZY_MIN_SEARCH_MARGIN = 50  # Floor for the quote-scaled search margin
+    FUZZY_QGRAM_SIZE = 2  # q-gram length for the fuzzy sliding-window prefilter
+    PARALLEL_MIN_SECTIONS = 256  # Outline size at which sections are extracted in worker processes
 
     # Parser reliability weights for confidence scoring
     PARSER_WEIGHTS = {
@@ -72,15 +144,23 @@ class CitationExtractor:
         "unknown": 0.5  # Unknown format
     }
 
-    def __init__(self):
-        pass
+    def __init__(self, explain: bool = True):
+        """
+        Args:
+            explain: Build human-readable confidence_reasons for each citation.
+                Disable for bulk extraction; use explain_citation() on demand.
+        """
+        self.explain = explain
 
     def verify_citation_span(
         self,
         quote_text: str,
         full_text: str,
         claimed_start: int,
-        claimed_end: int
+        claimed_end: int,
+        full_text_lower: Optional[str] = None,
+        trust_span: bool = False,
+        quote_lower: Optional[str] = None
     ) -> Tuple[bool, str, int, int]:
         """
         Verify that a citation span actually exists in the text
@@ -90,10 +170,20 @@ class CitationExtractor:
             full_text: The full document text
             claimed_start: Claimed start position
             claimed_end: Claimed end position
+            full_text_lower: Pre-lowered full_text, shared across citations of one document
+            trust_span: Caller sliced quote_text out of the claimed span itself,
+                so only surrounding whitespace can differ
+            quote_lower: Pre-lowered quote_text, if the caller already has it
 
         Returns:
             Tuple of (verified, match_method, actual_start, actual_end)
         """
+        # Self-sliced spans: locate the stripped quote inside the claimed span
+        if trust_span:
+            pos = full_text.find(quote_text, claimed_start, claimed_end)
+            if pos != -1:
+                return True, "exact", pos, pos + len(quote_text)
+
         # Try exact match at claimed position first
         if claimed_start >= 0 and claimed_end <= len(full_text):
             actual_text = full_text[claimed_start:claimed_end]
@@ -101,8 +191,9 @@ class CitationExtractor:
                 return True, "exact", claimed_start, claimed_end
 
         # Try exact match anywhere in the document
-        quote_lower = quote_text.lower().strip()
-        text_lower = full_text.lower()
+        if quote_lower is None:
+            quote_lower = quote_text.lower().strip()
+        text_lower = full_text_lower if full_text_lower is not None else full_text.lower()
 
         exact_pos = text_lower.find(quote_lower)
         if exact_pos != -1:
@@ -121,26 +212,101 @@ class CitationExtractor:
         """
         Attempt fuzzy matching to find the citation span
 
-        Uses sliding window approach to find best match
+        Uses RapidFuzz partial alignment when available, otherwise a
+        sliding window approach to find best match
         """
         quote_len = len(quote_text)
         best_ratio = 0.0
         best_start = claimed_start
         best_end = claimed_end
 
-        # Search window around claimed position (±200 chars)
-        search_start = max(0, claimed_start - 200)
-        search_end = min(len(full_text), claimed_end + 200)
-
-        # Sliding window search
-        for i in range(search_start, search_end - quote_len + 1):
-            window = full_text[i:i + quote_len]
-            ratio = SequenceMatcher(None, quote_text.lower(), window.lower()).ratio()
+        # Search window around claimed position, scaled to the quote
+        # (between FUZZY_MIN_SEARCH_MARGIN and FUZZY_SEARCH_MARGIN chars each side)
+        margin = min(self.FUZZY_SEARCH_MARGIN, max(self.FUZZY_MIN_SEARCH_MARGIN, quote_len // 2))
+        search_start = max(0, claimed_start - margin)
+        search_end = min(len(full_text), claimed_end + margin)
+
+        # Quote cannot fit inside the search window
+        if search_end - search_start < quote_len:
+            return False, "none", claimed_start, claimed_end
+
+        if fuzz is not None:
+            # Single C++ pass over the window instead of one ratio per offset
+            alignment = fuzz.partial_ratio_alignment(
+                quote_text.lower(),
+                full_text[search_start:search_end].lower(),
+                score_cutoff=self.FUZZY_MATCH_THRESHOLD * 100
+            )
+            if alignment is not None:
+                return (
+                    True,
+                    "fuzzy",
+                    search_start + alignment.dest_start,
+                    search_start + alignment.dest_end
+                )
+            return False, "none", claimed_start, claimed_end
+
+        # Sliding window search over a lowercased copy of the search window
+        quote_lower = quote_text.lower()
+        haystack = full_text[search_start:search_end]
+        haystack_lower = haystack.lower()
+
+        # Rolling q-gram filter: by the q-gram lemma, a window within the indel
+        # distance allowed by FUZZY_MATCH_THRESHOLD shares at least min_shared
+        # q-grams with the quote, so windows below that never reach the ratio.
+        # Disabled when case folding changes string lengths (rare Unicode).
+        k = self.FUZZY_QGRAM_SIZE
+        use_filter = (
+            quote_len > k
+            and len(quote_lower) == quote_len
+            and len(haystack_lower) == len(haystack)
+        )
+        if use_filter:
+            quote_grams = Counter(quote_lower[j:j + k] for j in range(quote_len - k + 1))
+            window_grams = Counter(haystack_lower[j:j + k] for j in range(quote_len - k + 1))
+            shared = sum((quote_grams & window_grams).values())
+            max_indels = int(2 * (1 - self.FUZZY_MATCH_THRESHOLD) * quote_len)
+            min_shared = (quote_len - k + 1) - k * max_indels
+
+        # The quote is seq2 so SequenceMatcher indexes it once for every window;
+        # autojunk would drop frequent characters from quotes over 200 chars
+        threshold = self.FUZZY_MATCH_THRESHOLD
+        matcher = SequenceMatcher(None, autojunk=False)
+        matcher.set_seq2(quote_lower)
+
+        for i in range(len(haystack) - quote_len + 1):
+            if use_filter:
+                if i > 0:
+                    # Slide one char: drop the window's first q-gram, add the new last one
+                    old_gram = haystack_lower[i - 1:i - 1 + k]
+                    window_grams[old_gram] -= 1
+                    if window_grams[old_gram] < quote_grams[old_gram]:
+                        shared -= 1
+                    new_gram = haystack_lower[i + quote_len - k:i + quote_len]
+                    if window_grams[new_gram] < quote_grams[new_gram]:
+                        shared += 1
+                    window_grams[new_gram] += 1
+
+                if shared < min_shared:
+                    continue
+                window = haystack_lower[i:i + quote_len]
+            else:
+                window = haystack[i:i + quote_len].lower()
+
+            # real_quick_ratio/quick_ratio are cheap upper bounds on ratio()
+            matcher.set_seq1(window)
+            if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                continue
+            ratio = matcher.ratio()
 
             if ratio > best_ratio:
                 best_ratio = ratio
-                best_start = i
-                best_end = i + quote_len
+                best_start = search_start + i
+                best_end = best_start + quote_len
+
+                # Nothing can beat an identical window
+                if ratio == 1.0:
+                    break
 
         # Check if fuzzy match meets threshold
         if best_ratio >= self.FUZZY_MATCH_THRESHOLD:
@@ -157,7 +323,8 @@ class CitationExtractor:
         doc_id: str,
         version_id: str,
         is_pdf: bool = False,
-        mime_type: str = "unknown"
+        mime_type: str = "unknown",
+        max_workers: Optional[int] = None
     ) -> Tuple[List[Citation], float]:
         """
         Extract citations from a document with verification
@@ -170,27 +337,91 @@ class CitationExtractor:
             version_id: Version ID
             is_pdf: Whether this is a PDF document
             mime_type: Document MIME type for parser reliability scoring
+            max_workers: Section runs handed to worker processes for large outlines (1 disables parallelism)
 
         Returns:
             Tuple of (citations list, overall confidence score)
         """
-        citations = []
+        accumulator = _ConfidenceAccumulator()
+        citations = list(self.iter_citations(
+            text=text,
+            outline=outline,
+            page_map=page_map,
+            doc_id=doc_id,
+            version_id=version_id,
+            is_pdf=is_pdf,
+            mime_type=mime_type,
+            max_workers=max_workers,
+            accumulator=accumulator
+        ))
+
+        return citations, accumulator.overall(self._parser_weight(mime_type))
+
+    def iter_citations(
+        self,
+        text: str,
+        outline: List[Dict[str, Any]],
+        page_map: Optional[Dict[str, Any]],
+        doc_id: str,
+        version_id: str,
+        is_pdf: bool = False,
+        mime_type: str = "unknown",
+        max_workers: Optional[int] = None,
+        accumulator: Optional[_ConfidenceAccumulator] = None
+    ) -> Iterator[Citation]:
+        """
+        Yield citations one at a time instead of building the full list
 
+        Same arguments as extract_citations. Pass a _ConfidenceAccumulator to
+        collect the overall confidence while the citations are consumed.
+        """
         if not text or len(text) < self.MIN_CITATION_LENGTH:
-            return citations, 0.0
+            return
+
+        # Lowercase the document and resolve the parser weight once
+        text_lower = text.lower()
+        parser_weight = self._parser_weight(mime_type)
+        add = accumulator.add if accumulator is not None else None
 
-        # Extract citations for each section in the outline
-        for section in outline:
-            section_citations = self._extract_from_section(
+        # Large outlines: sections are independent, fan them out to processes
+        parallel_citations = None
+        if len(outline) >= self.PARALLEL_MIN_SECTIONS and max_workers != 1:
+            parallel_citations = self._extract_sections_parallel(
                 text=text,
-                section=section,
+                outline=outline,
                 page_map=page_map,
                 doc_id=doc_id,
                 version_id=version_id,
                 is_pdf=is_pdf,
-                mime_type=mime_type
+                mime_type=mime_type,
+                max_workers=max_workers
             )
-            citations.extend(section_citations)
+
+        if parallel_citations is not None:
+            for citation in parallel_citations:
+                if add:
+                    add(citation)
+                yield citation
+        else:
+            # Extract citations for each section in the outline; the bound
+            # method is hoisted out of the loop
+            extract_section = self._extract_from_section
+            for section in outline:
+                section_citations = extract_section(
+                    text=text,
+                    section=section,
+                    page_map=page_map,
+                    doc_id=doc_id,
+                    version_id=version_id,
+                    is_pdf=is_pdf,
+                    mime_type=mime_type,
+                    text_lower=text_lower,
+                    parser_weight=parser_weight
+                )
+                for citation in section_citations:
+                    if add:
+                        add(citation)
+                    yield citation
 
         # If no outline, create citations from whole document
         if not outline:
@@ -203,20 +434,56 @@ class CitationExtractor:
                 doc_id=doc_id,
                 version_id=version_id,
                 full_text=text,
-                mime_type=mime_type
+                mime_type=mime_type,
+                full_text_lower=text_lower,
+                trust_span=True,
+                parser_weight=parser_weight
             )
-            citations.append(full_doc_citation)
+            if add:
+                add(full_doc_citation)
+            yield full_doc_citation
 
-        # Calculate overall confidence
-        overall_confidence = self._calculate_overall_confidence(
-            text=text,
-            outline=outline,
-            page_map=page_map,
-            citations=citations,
-            mime_type=mime_type
-        )
+    def _extract_sections_parallel(
+        self,
+        text: str,
+        outline: List[Dict[str, Any]],
+        page_map: Optional[Dict[str, Any]],
+        doc_id: str,
+        version_id: str,
+        is_pdf: bool,
+        mime_type: str,
+        max_workers: Optional[int] = None
+    ) -> Optional[List[Citation]]:
+        """
+        Extract section citations in the shared worker pool (see parse_pool)
+
+        The outline is split into one contiguous run of sections per worker,
+        so the document is pickled once per run rather than once per section.
+        Blocks until every run is done; async callers run this in a thread.
 
-        return citations, overall_confidence
+        Returns:
+            Citations in outline order, or None if worker processes are unavailable
+        """
+        workers = max_workers or os.cpu_count() or 1
+        step = -(-len(outline) // min(workers, len(outline)))
+
+        pool = get_parse_pool()
+        try:
+            futures = [
+                pool.submit(
+                    _extract_sections_worker,
+                    type(self), self.explain, text, outline[start:start + step],
+                    page_map, doc_id, version_id, is_pdf, mime_type
+                )
+                for start in range(0, len(outline), step)
+            ]
+            return [citation for future in futures for citation in future.result()]
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning("Parallel citation extraction unavailable, falling back to serial: %s", e)
+            if isinstance(e, BrokenProcessPool):
+                # Replace the dead pool for the next caller
+                shutdown_parse_pool(pool)
+            return None
 
     def _extract_from_section(
         self,
@@ -226,7 +493,9 @@ class CitationExtractor:
         doc_id: str,
         version_id: str,
         is_pdf: bool,
-        mime_type: str = "unknown"
+        mime_type: str = "unknown",
+        text_lower: Optional[str] = None,
+        parser_weight: Optional[float] = None
     ) -> List[Citation]:
         """Extract citations from a single section with verification"""
         citations = []
@@ -236,42 +505,38 @@ class CitationExtractor:
         end_char = section.get("end_char", len(text))
         page_num = section.get("page")
 
-        # Extract the section text
-        section_text = text[start_char:end_char]
+        # Resolve the section bounds without copying the whole section
+        # (slice semantics, so out-of-range or negative offsets behave as before)
+        lo, hi, _ = slice(start_char, end_char).indices(len(text))
+        section_len = max(0, hi - lo)
 
-        if len(section_text) < self.MIN_CITATION_LENGTH:
+        if section_len < self.MIN_CITATION_LENGTH:
             return citations
 
-        # For long sections, break into smaller citation chunks
-        if len(section_text) > self.MAX_CITATION_LENGTH:
-            # Extract first part as citation
-            citation_text = section_text[:self.MAX_CITATION_LENGTH]
-            citation = self._create_citation(
-                text=citation_text,
-                section_title=section_title,
-                char_start=start_char,
-                char_end=start_char + self.MAX_CITATION_LENGTH,
-                page_num=page_num,
-                doc_id=doc_id,
-                version_id=version_id,
-                full_text=text,
-                mime_type=mime_type
-            )
-            citations.append(citation)
+        # For long sections, only the first MAX_CITATION_LENGTH chars are cited
+        if section_len > self.MAX_CITATION_LENGTH:
+            citation_text = text[lo:lo + self.MAX_CITATION_LENGTH]
+            citation_end = start_char + self.MAX_CITATION_LENGTH
         else:
             # Entire section as citation
-            citation = self._create_citation(
-                text=section_text,
-                section_title=section_title,
-                char_start=start_char,
-                char_end=end_char,
-                page_num=page_num,
-                doc_id=doc_id,
-                version_id=version_id,
-                full_text=text,
-                mime_type=mime_type
-            )
-            citations.append(citation)
+            citation_text = text[lo:hi]
+            citation_end = end_char
+
+        citation = self._create_citation(
+            text=citation_text,
+            section_title=section_title,
+            char_start=start_char,
+            char_end=citation_end,
+            page_num=page_num,
+            doc_id=doc_id,
+            version_id=version_id,
+            full_text=text,
+            mime_type=mime_type,
+            full_text_lower=text_lower,
+            trust_span=True,
+            parser_weight=parser_weight
+        )
+        citations.append(citation)
 
         return citations
 
@@ -285,9 +550,15 @@ class CitationExtractor:
         doc_id: str,
         version_id: str,
         full_text: str = "",
-        mime_type: str = "unknown"
+        mime_type: str = "unknown",
+        full_text_lower: Optional[str] = None,
+        trust_span: bool = False,
+        parser_weight: Optional[float] = None
     ) -> Citation:
         """Create a citation object with verification"""
+        # Strip once; verification, scoring and the stored quote share it
+        text = text.strip()
+
         # Verify the citation span if we have full text
         verified = False
         match_method = "exact"
@@ -296,10 +567,12 @@ class CitationExtractor:
 
         if full_text:
             verified, match_method, actual_start, actual_end = self.verify_citation_span(
-                quote_text=text.strip(),
+                quote_text=text,
                 full_text=full_text,
                 claimed_start=char_start,
-                claimed_end=char_end
+                claimed_end=char_end,
+                full_text_lower=full_text_lower,
+                trust_span=trust_span
             )
 
         location = CitationLocation(
@@ -316,14 +589,15 @@ class CitationExtractor:
             page_num=page_num,
             verified=verified,
             match_method=match_method,
-            mime_type=mime_type
+            mime_type=mime_type,
+            parser_weight=parser_weight
         )
 
         return Citation(
             doc_id=doc_id,
             version_id=version_id,
             citation_type="user_upload",
-            text=text.strip(),
+            text=text,
             location=location,
             confidence=confidence,
             verified=verified,
@@ -338,7 +612,9 @@ class CitationExtractor:
         page_num: Optional[int],
         verified: bool = False,
         match_method: str = "exact",
-        mime_type: str = "unknown"
+        mime_type: str = "unknown",
+        parser_weight: Optional[float] = None,
+        explain: Optional[bool] = None
     ) -> Tuple[float, List[str]]:
         """
         Calculate deterministic confidence score for a citation with explainable reasons
@@ -350,35 +626,49 @@ class CitationExtractor:
         d) Structure metadata (section heading, page number): +0.1 each
         e) Text length adequacy: +0.1
 
+        Reason strings are only built when explain (default: self.explain) is set.
+
         Returns:
             Tuple of (confidence_score, reasons_list)
         """
-        confidence = 0.0
+        if explain is None:
+            explain = self.explain
+
+        # Factor c) Parser reliability (resolved once per document by callers)
+        if parser_weight is None:
+            parser_weight = self._parser_weight(mime_type)
+
+        # The score only depends on a coarse signature, so it is memoized;
+        # reason strings quote the actual values and are built separately
+        confidence = _score_citation(
+            verified,
+            match_method,
+            parser_weight,
+            bool(section_title),
+            page_num is not None,
+            len(text) >= self.MIN_CITATION_LENGTH
+        )
+
+        if not explain:
+            return confidence, []
+
         reasons = []
 
         # Factor a) Verification status (most important)
         if verified:
-            confidence += 0.4
             reasons.append("Citation verified in source text")
         else:
-            confidence -= 0.3
             reasons.append("WARNING: Citation could not be verified in source text")
 
         # Factor b) Match method
         if match_method == "exact":
-            confidence += 0.2
             reasons.append("Exact match found at claimed position")
         elif match_method == "fuzzy":
-            confidence += 0.1
             reasons.append(f"Fuzzy match found (similarity >= {self.FUZZY_MATCH_THRESHOLD})")
         else:
-            confidence -= 0.2
             reasons.append("WARNING: No match found for citation")
 
         # Factor c) Parser reliability
-        parser_weight = self.PARSER_WEIGHTS.get(mime_type, self.PARSER_WEIGHTS["unknown"])
-        confidence = confidence * parser_weight
-
         if parser_weight >= 0.9:
             reasons.append(f"High parser reliability ({mime_type})")
         elif parser_weight >= 0.75:
@@ -387,64 +677,57 @@ class CitationExtractor:
             reasons.append(f"Moderate parser reliability ({mime_type})")
 
         # Factor d) Structural metadata
-        if section_title and len(section_title) > 0:
-            confidence += 0.1
+        if section_title:
             reasons.append(f"Section heading available: '{section_title}'")
 
         if page_num is not None:
-            confidence += 0.1
             reasons.append(f"Page number available: {page_num}")
 
         # Factor e) Text length
         if len(text) >= self.MIN_CITATION_LENGTH:
-            confidence += 0.1
             reasons.append(f"Adequate citation length ({len(text)} chars)")
         else:
             reasons.append(f"WARNING: Short citation ({len(text)} chars)")
 
-        # Normalize to [0.0, 1.0]
-        confidence = max(0.0, min(confidence, 1.0))
-
         return confidence, reasons
 
-    def _calculate_overall_confidence(
-        self,
-        text: str,
-        outline: List[Dict[str, Any]],
-        page_map: Optional[Dict[str, Any]],
-        citations: List[Citation],
-        mime_type: str = "unknown"
-    ) -> float:
-        """
-        Calculate overall confidence for citation extraction based on citation quality
-
-        Uses average of individual citation confidences weighted by verification status
+    def explain_citation(self, citation: Citation, mime_type: str = "unknown") -> List[str]:
         """
-        if not citations:
-            return 0.0
-
-        # Calculate weighted average of citation confidences
-        total_weight = 0.0
-        weighted_sum = 0.0
+        Re-derive the confidence reasons for a single citation on demand
 
-        for citation in citations:
-            # Verified citations get more weight
-            weight = 1.5 if citation.verified else 1.0
-            weighted_sum += citation.confidence * weight
-            total_weight += weight
+        Useful when extraction ran with explain=False and a detail view
+        needs the explanation for one citation.
 
-        avg_confidence = weighted_sum / total_weight if total_weight > 0 else 0.0
+        Args:
+            citation: Citation to explain
+            mime_type: Document MIME type used during extraction
 
-        # Apply parser reliability weight
-        parser_weight = self.PARSER_WEIGHTS.get(mime_type, self.PARSER_WEIGHTS["unknown"])
-        overall = avg_confidence * parser_weight
+        Returns:
+            List of human-readable reasons
+        """
+        _, reasons = self._calculate_citation_confidence(
+            text=citation.text,
+            section_title=citation.location.section,
+            page_num=citation.location.page,
+            verified=citation.verified,
+            match_method=citation.match_method,
+            mime_type=mime_type,
+            explain=True
+        )
+        return reasons
 
-        # Bonus for having multiple verified citations (up to +0.1)
-        verified_count = sum(1 for c in citations if c.verified)
-        verification_bonus = min(0.1, verified_count * 0.02)
-        overall += verification_bonus
+    def _parser_weight(self, mime_type: Optional[str]) -> float:
+        """
+        Look up the parser reliability weight for a MIME type
 
-        return min(overall, 1.0)
+        Exact keys hit the dict directly; otherwise parameters such as
+        "; charset=utf-8" and letter case are ignored.
+        """
+        weights = self.PARSER_WEIGHTS
+        weight = weights.get(mime_type) if mime_type else None
+        if weight is None and mime_type:
+            weight = weights.get(mime_type.split(";", 1)[0].strip().lower())
+        return weight if weight is not None else weights["unknown"]
 
     def can_cite(self, confidence: float) -> bool:
         """
@@ -462,7 +745,8 @@ class CitationExtractor:
         self,
         text: str,
         query: str,
-        section_title: Optional[str] = None
+        section_title: Optional[str] = None,
+        text_lower: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Find specific text spans in the document that match a query
@@ -472,13 +756,16 @@ class CitationExtractor:
             text: Full document text
             query: Text to find
             section_title: Optional section to search within
+            text_lower: Pre-lowered text, so callers querying one document
+                repeatedly only lowercase it once
 
         Returns:
             List of matching spans with positions
         """
         spans = []
         query_lower = query.lower()
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
 
         # Find all occurrences
         start = 0
@@ -487,23 +774,82 @@ class CitationExtractor:
             if pos == -1:
                 break
 
-            # Extract context around the match
-            context_start = max(0, pos - 100)
-            context_end = min(len(text), pos + len(query) + 100)
-            context = text[context_start:context_end]
-
-            span = {
-                "text": text[pos:pos + len(query)],
-                "char_start": pos,
-                "char_end": pos + len(query),
-                "context": context
-            }
-
-            spans.append(span)
+            spans.append(self._make_span(text, pos, len(query)))
             start = pos + len(query)
 
         return spans
 
+    def find_citation_spans_batch(
+        self,
+        text: str,
+        queries: List[str],
+        text_lower: Optional[str] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Find spans for many queries against the same document
+        Uses a single Aho-Corasick pass when pyahocorasick is available
+
+        Args:
+            text: Full document text
+            queries: Texts to find
+            text_lower: Optional pre-lowered text
+
+        Returns:
+            Mapping of each query to its matching spans (same format as find_citation_spans)
+        """
+        if text_lower is None:
+            text_lower = text.lower()
+
+        results: Dict[str, List[Dict[str, Any]]] = {query: [] for query in queries}
+
+        # Queries that lowercase to the same needle share one automaton entry
+        needles: Dict[str, List[str]] = {}
+        for query in results:
+            if query:
+                needles.setdefault(query.lower(), []).append(query)
+
+        if not needles:
+            return results
+
+        if ahocorasick is None:
+            for needle_queries in needles.values():
+                for query in needle_queries:
+                    results[query] = self.find_citation_spans(text, query, text_lower=text_lower)
+            return results
+
+        automaton = ahocorasick.Automaton()
+        for needle in needles:
+            automaton.add_word(needle, needle)
+        automaton.make_automaton()
+
+        # The automaton reports overlapping hits; keep the non-overlapping
+        # left-to-right matches that find_citation_spans returns
+        next_start = dict.fromkeys(needles, 0)
+        for end_idx, needle in automaton.iter(text_lower):
+            pos = end_idx - len(needle) + 1
+            if pos < next_start[needle]:
+                continue
+            next_start[needle] = pos + len(needle)
+
+            for query in needles[needle]:
+                results[query].append(self._make_span(text, pos, len(query)))
+
+        return results
+
+    @staticmethod
+    def _make_span(text: str, pos: int, length: int) -> Dict[str, Any]:
+        """Build a span dict with surrounding context for a match at pos"""
+        # Extract context around the match
+        context_start = max(0, pos - 100)
+        context_end = min(len(text), pos + length + 100)
+
+        return {
+            "text": text[pos:pos + length],
+            "char_start": pos,
+            "char_end": pos + length,
+            "context": text[context_start:context_end]
+        }
+
     def extract_upload_citations(
         self,
         version_data: Dict[str, Any],
@@ -525,15 +871,16 @@ class CitationExtractor:
 
         # Parse outline
         outline_json = version_data.get("outline_json")
-        outline = json.loads(outline_json) if outline_json else []
+        outline = _load_json_column(outline_json) if outline_json else []
 
         # Parse page map
         page_map_json = version_data.get("page_map_json")
-        page_map = json.loads(page_map_json) if page_map_json else None
+        page_map = _load_json_column(page_map_json) if page_map_json else None
 
         # Get MIME type for parser reliability scoring
-        upload_mime = version_data.get("upload_mime", "unknown")
-        is_pdf = upload_mime.lower() == "application/pdf" or upload_mime.lower() == "pdf"
+        upload_mime = version_data.get("upload_mime") or "unknown"
+        upload_mime_lower = upload_mime.lower()
+        is_pdf = upload_mime_lower == "application/pdf" or upload_mime_lower == "pdf"
 
         # Extract citations with verification
         return self.extract_citations(
@@ -547,5 +894,112 @@ class CitationExtractor:
         )
 
 
+@lru_cache(maxsize=1024)
+def _score_citation(
+    verified: bool,
+    match_method: str,
+    parser_weight: float,
+    has_section: bool,
+    has_page: bool,
+    adequate_length: bool
+) -> float:
+    """Deterministic citation score for one signature (see _calculate_citation_confidence)"""
+    confidence = 0.0
+
+    # a) Verification status
+    confidence += 0.4 if verified else -0.3
+
+    # b) Match method
+    if match_method == "exact":
+        confidence += 0.2
+    elif match_method == "fuzzy":
+        confidence += 0.1
+    else:
+        confidence -= 0.2
+
+    # c) Parser reliability
+    confidence = confidence * parser_weight
+
+    # d) Structural metadata
+    if has_section:
+        confidence += 0.1
+    if has_page:
+        confidence += 0.1
+
+    # e) Text length
+    if adequate_length:
+        confidence += 0.1
+
+    # Normalize to [0.0, 1.0]
+    return max(0.0, min(confidence, 1.0))
+
+
+# Per-process state for parallel section extraction:
+# one extractor per worker process, keyed by (class, explain)
+_worker_state: Dict[Tuple[type, bool], Any] = {}
+
+
+def _extract_sections_worker(
+    extractor_cls: type,
+    explain: bool,
+    text: str,
+    sections: List[Dict[str, Any]],
+    page_map: Optional[Dict[str, Any]],
+    doc_id: str,
+    version_id: str,
+    is_pdf: bool,
+    mime_type: str
+) -> List[Citation]:
+    """Pool task: extract citations for a contiguous run of sections"""
+    extractor = _worker_state.get((extractor_cls, explain))
+    if extractor is None:
+        extractor = _worker_state[(extractor_cls, explain)] = extractor_cls(explain=explain)
+
+    text_lower = text.lower()
+    parser_weight = extractor._parser_weight(mime_type)
+
+    citations = []
+    for section in sections:
+        citations.extend(extractor._extract_from_section(
+            text=text,
+            section=section,
+            page_map=page_map,
+            doc_id=doc_id,
+            version_id=version_id,
+            is_pdf=is_pdf,
+            mime_type=mime_type,
+            text_lower=text_lower,
+            parser_weight=parser_weight
+        ))
+    return citations
+
+
+def _citation_default(obj: Any) -> Dict[str, Any]:
+    """orjson default hook: emit citations in their to_dict() shape"""
+    if isinstance(obj, (Citation, CitationLocation)):
+        return obj.to_dict()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def citations_to_json(obj: Any) -> bytes:
+    """
+    Serialize a citation, or any structure containing citations, to JSON bytes
+
+    orjson would otherwise encode the dataclasses field by field; passing them
+    through _citation_default keeps the API keys ("type", "quote_text") and
+    drops unset location fields in a single dumps call.
+    """
+    return orjson.dumps(obj, default=_citation_default, option=orjson.OPT_PASSTHROUGH_DATACLASS)
+
+
+def _load_json_column(value: Any) -> Any:
+    """Parse a JSON column (str or bytes) with orjson, falling back to stdlib json"""
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        # stdlib json accepts extensions orjson rejects (e.g. NaN)
+        return json.loads(value)
+
+
 # Global instance
 citation_extractor = CitationExtractor()
@@ -3,11 +3,19 @@ Policy Analyzer for Terms of Service, Privacy Policies, and User Agreements
 Focuses on data rights, power imbalances, and consumer protections
 """
 import re
-from typing import Dict, Any, List, Optional, Tuple
+from bisect import bisect_left
+from collections import Counter
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 
+try:
+    import ahocorasick
+except ImportError:  # Optional; keyword scan falls back to one regex per category
+    ahocorasick = None
 
-@dataclass
+
+@dataclass(slots=True)
 class PowerImbalance:
     """Represents an identified power imbalance in the agreement"""
     category: str  # e.g., "unilateral_changes", "data_rights", "liability_asymmetry"
@@ -20,7 +28,7 @@ class PowerImbalance:
     end_char: int
 
 
-@dataclass
+@dataclass(slots=True)
 class DataRightIssue:
     """Issues related to user data and privacy"""
     right_type: str  # e.g., "collection", "sharing", "retention", "deletion"
@@ -186,61 +194,293 @@ CONSUMER_RED_FLAGS = {
     ]
 }
 
+# Clause indicators (matched as lowercase substrings)
+COMPANY_CAN_INDICATORS = ["we may", "we can", "we reserve", "at our discretion"]
+USER_MUST_INDICATORS = ["you must", "you agree", "you shall", "you are required"]
+
+# Positive control indicators
+POSITIVE_CONTROL_INDICATORS = [
+    "you can",
+    "you may",
+    "right to",
+    "opt out",
+    "opt-out",
+    "choice",
+    "consent"
+]
+
+# Negative control indicators
+NEGATIVE_CONTROL_INDICATORS = [
+    "we may",
+    "without your consent",
+    "automatically",
+    "required",
+    "necessary for service"
+]
+
+
+def _indicator_pattern(indicators: List[str]) -> re.Pattern:
+    """One substring alternation for an indicator list, searched once per clause"""
+    return re.compile('|'.join(re.escape(indicator) for indicator in indicators))
+
+
+_COMPANY_CAN_PATTERN = _indicator_pattern(COMPANY_CAN_INDICATORS)
+_USER_MUST_PATTERN = _indicator_pattern(USER_MUST_INDICATORS)
+_POSITIVE_CONTROL_PATTERN = _indicator_pattern(POSITIVE_CONTROL_INDICATORS)
+_NEGATIVE_CONTROL_PATTERN = _indicator_pattern(NEGATIVE_CONTROL_INDICATORS)
+
+
+# Max chars a keyword hit may sit from either end of its cited sentence span
+SENTENCE_CONTEXT_CHARS = 200
+
+SENTENCE_TERMINATOR = re.compile(r'[.!?]')
+
+# Every detector category as (detector, category, keywords), in detector order
+CATEGORY_ENTRIES: List[Tuple[str, str, List[str]]] = (
+    [("power", category, config["keywords"])
+     for category, config in POWER_IMBALANCE_PATTERNS.items()]
+    + [("data", right_type, config["keywords"])
+       for right_type, config in DATA_RIGHTS_PATTERNS.items()]
+    + [("red_flag", flag_type, keywords)
+       for flag_type, keywords in CONSUMER_RED_FLAGS.items()]
+)
+
+
+def _build_keyword_automaton():
+    """One Aho-Corasick automaton over all lowercased keywords -> category indices"""
+    if ahocorasick is None:
+        return None
+
+    by_keyword: Dict[str, List[int]] = {}
+    for index, (_, _, keywords) in enumerate(CATEGORY_ENTRIES):
+        for keyword in keywords:
+            by_keyword.setdefault(keyword.lower(), []).append(index)
+
+    automaton = ahocorasick.Automaton()
+    for keyword, indices in by_keyword.items():
+        automaton.add_word(keyword, (len(keyword), indices))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+# One keyword regex per category for the fallback path, compiled once at
+# import. The lookahead reports the longest category keyword starting at
+# every offset (overlaps included), matching what the automaton yields.
+# Patterns are lowercase and case-sensitive: they run on lower_text_for_scan().
+_CATEGORY_PATTERNS = [
+    re.compile(
+        r'(?=('
+        + '|'.join(
+            re.escape(keyword)
+            for keyword in sorted({k.lower() for k in keywords}, key=len, reverse=True)
+        )
+        + r'))'
+    )
+    for _, _, keywords in CATEGORY_ENTRIES
+]
 
-def detect_power_imbalances(text: str) -> List[PowerImbalance]:
+KeywordSpans = Dict[int, List[Tuple[int, int]]]
+
+
+def lower_text_for_scan(text: str) -> str:
     """
-    Detect power imbalances in the policy
-    Returns list of identified imbalances with citations
+    Lowercase text while keeping every character offset valid for text
+
+    The few characters whose lowercase form is longer (e.g. U+0130) are left
+    as-is, so spans found in the result can be sliced from the original.
     """
-    imbalances = []
     text_lower = text.lower()
+    if len(text_lower) == len(text):
+        return text_lower
+    return "".join(low if len(low := ch.lower()) == 1 else ch for ch in text)
 
-    for category, config in POWER_IMBALANCE_PATTERNS.items():
-        for keyword in config["keywords"]:
-            # Find sentences containing the keyword
-            pattern = re.compile(
-                r'([^.!?]{0,200}' + re.escape(keyword) + r'[^.!?]{0,200}[.!?])',
-                re.IGNORECASE
-            )
 
-            for match in pattern.finditer(text):
-                sentence = match.group(1).strip()
-                start = match.start()
-                end = match.end()
-
-                # Extract what company can do vs what user can do
-                company_power, user_power = analyze_clause_balance(sentence)
-
-                imbalance = PowerImbalance(
-                    category=category,
-                    description=config["description"],
-                    severity=config["severity"],
-                    company_power=company_power,
-                    user_power=user_power,
-                    citation_text=sentence,
-                    start_char=start,
-                    end_char=end
-                )
-                imbalances.append(imbalance)
+def _keyword_hits(text_lower: str) -> Iterator[Tuple[int, int, Iterable[int]]]:
+    """Yield (start, end, CATEGORY_ENTRIES indices) for each keyword occurrence"""
+    if _KEYWORD_AUTOMATON is not None:
+        for end_index, (length, indices) in _KEYWORD_AUTOMATON.iter(text_lower):
+            yield end_index - length + 1, end_index + 1, indices
+        return
+
+    # No automaton: one regex per category over the lowercased text
+    for index, pattern in enumerate(_CATEGORY_PATTERNS):
+        category = (index,)
+        for match in pattern.finditer(text_lower):
+            hit_start = match.start()
+            yield hit_start, hit_start + len(match.group(1)), category
+
+
+def scan_keyword_sentences(text: str, text_lower: Optional[str] = None) -> KeywordSpans:
+    """
+    Find the cited sentence spans for every detector category in one pass
+
+    Returns {CATEGORY_ENTRIES index: [(start, end), ...]} in document order.
+    Sentence boundaries come from a single terminator scan; each keyword hit
+    is mapped to its sentence by binary search. A category cites a sentence
+    once: the span ends after the terminator and starts at the sentence
+    start or 200 chars before the category's first hit, whichever is later.
+    Hits more than 200 chars before their terminator are ignored.
+
+    text_lower: lower_text_for_scan(text), if the caller already has it
+    """
+    if text_lower is None:
+        text_lower = lower_text_for_scan(text)
+
+    terminators = [m.start() for m in SENTENCE_TERMINATOR.finditer(text)]
+    n_terminators = len(terminators)
+    context = SENTENCE_CONTEXT_CHARS
+
+    # First usable hit per (category, sentence); hits do not arrive in start
+    # order, so a shorter keyword ending later can still start earlier
+    first_hit: Dict[Tuple[int, int], int] = {}
+    for hit_start, hit_end, indices in _keyword_hits(text_lower):
+        sentence = bisect_left(terminators, hit_start)
+        if sentence == n_terminators:
+            continue  # No terminator after the hit
+        if terminators[sentence] - hit_end > context:
+            continue  # Terminator too far after the hit
+        for index in indices:
+            key = (index, sentence)
+            if hit_start < first_hit.get(key, hit_start + 1):
+                first_hit[key] = hit_start
+
+    spans: KeywordSpans = {}
+    for (index, sentence), hit_start in sorted(first_hit.items()):
+        sentence_start = terminators[sentence - 1] + 1 if sentence else 0
+        spans.setdefault(index, []).append(
+            (max(sentence_start, hit_start - context), terminators[sentence] + 1)
+        )
+    return spans
+
+
+def _power_imbalance_item(text: str, text_lower: str, category: str, start: int, end: int) -> PowerImbalance:
+    """Build a PowerImbalance for one cited sentence"""
+    config = POWER_IMBALANCE_PATTERNS[category]
+    sentence = text[start:end].strip()
+
+    # Extract what company can do vs what user can do
+    company_power, user_power = analyze_clause_balance(
+        sentence, clause_lower=text_lower[start:end].strip()
+    )
+
+    return PowerImbalance(
+        category=category,
+        description=config["description"],
+        severity=config["severity"],
+        company_power=company_power,
+        user_power=user_power,
+        citation_text=sentence,
+        start_char=start,
+        end_char=end
+    )
+
+
+def _data_issue_item(text: str, text_lower: str, right_type: str, start: int, end: int) -> DataRightIssue:
+    """Build a DataRightIssue for one cited sentence"""
+    sentence = text[start:end].strip()
+
+    # Determine user control level
+    user_control = assess_user_control(
+        sentence, right_type, clause_lower=text_lower[start:end].strip()
+    )
+
+    return DataRightIssue(
+        right_type=right_type,
+        description=f"Data {right_type} clause found",
+        user_control=user_control,
+        citation_text=sentence,
+        start_char=start,
+        end_char=end
+    )
+
+
+def _red_flag_item(text: str, text_lower: str, flag_type: str, start: int, end: int) -> Dict[str, Any]:
+    """Build a red flag dict for one cited sentence"""
+    return {
+        "type": flag_type,
+        "text": text[start:end].strip(),
+        "start": start,
+        "end": end
+    }
+
+
+# Item builder per CATEGORY_ENTRIES detector tag
+_ITEM_BUILDERS = {
+    "power": _power_imbalance_item,
+    "data": _data_issue_item,
+    "red_flag": _red_flag_item,
+}
+
+
+def _collect_items(
+    text: str,
+    text_lower: str,
+    spans: KeywordSpans,
+    detectors: Tuple[str, ...]
+) -> Dict[str, List]:
+    """Build detector items from one keyword scan, in category table order"""
+    items: Dict[str, List] = {detector: [] for detector in detectors}
+
+    for index in sorted(spans):
+        detector, category, _ = CATEGORY_ENTRIES[index]
+        if detector not in items:
+            continue
+        build = _ITEM_BUILDERS[detector]
+        out = items[detector]
+        for start, end in spans[index]:
+            out.append(build(text, text_lower, category, start, end))
+
+    return items
+
+
+def _scan(text: str, detectors: Tuple[str, ...]) -> Dict[str, List]:
+    """Lowercase, scan and collect items for the given detectors"""
+    text_lower = lower_text_for_scan(text)
+    spans = scan_keyword_sentences(text, text_lower)
+    return _collect_items(text, text_lower, spans, detectors)
+
+
+def analyze_policy(
+    text: str
+) -> Tuple[List[PowerImbalance], List[DataRightIssue], List[Dict[str, Any]]]:
+    """
+    Run all three detectors over a single lowercase copy and keyword scan
+    Returns (power_imbalances, data_issues, red_flags)
+    """
+    items = _scan(text, ("power", "data", "red_flag"))
+    return (
+        deduplicate_by_position(items["power"]),
+        deduplicate_by_position(items["data"]),
+        items["red_flag"]
+    )
+
+
+def detect_power_imbalances(text: str) -> List[PowerImbalance]:
+    """
+    Detect power imbalances in the policy
+    Returns list of identified imbalances with citations
+    """
+    imbalances = _scan(text, ("power",))["power"]
 
     # Remove duplicates based on citation overlap
     return deduplicate_by_position(imbalances)
 
 
-def analyze_clause_balance(clause: str) -> Tuple[str, str]:
+def analyze_clause_balance(clause: str, clause_lower: Optional[str] = None) -> Tuple[str, str]:
     """
     Analyze a clause to extract company powers vs user powers
     Returns (company_power, user_power)
-    """
-    clause_lower = clause.lower()
 
-    # Company indicators
-    company_indicators = ["we", "our", "us", "company", "service provider"]
-    user_indicators = ["you", "your", "user", "customer", "subscriber"]
+    clause_lower: the clause already lowercased, if the caller has it
+    """
+    if clause_lower is None:
+        clause_lower = clause.lower()
 
     # Check for modal verbs indicating power
-    company_can = any(indicator in clause_lower for indicator in ["we may", "we can", "we reserve", "at our discretion"])
-    user_must = any(indicator in clause_lower for indicator in ["you must", "you agree", "you shall", "you are required"])
+    company_can = _COMPANY_CAN_PATTERN.search(clause_lower) is not None
+    user_must = _USER_MUST_PATTERN.search(clause_lower) is not None
 
     if company_can:
         company_power = "Can act at own discretion"
@@ -259,65 +499,21 @@ def detect_data_issues(text: str) -> List[DataRightIssue]:
     """
     Detect data rights and privacy issues
     """
-    issues = []
-
-    for right_type, config in DATA_RIGHTS_PATTERNS.items():
-        for keyword in config["keywords"]:
-            pattern = re.compile(
-                r'([^.!?]{0,200}' + re.escape(keyword) + r'[^.!?]{0,200}[.!?])',
-                re.IGNORECASE
-            )
-
-            for match in pattern.finditer(text):
-                sentence = match.group(1).strip()
-                start = match.start()
-                end = match.end()
-
-                # Determine user control level
-                user_control = assess_user_control(sentence, right_type)
-
-                issue = DataRightIssue(
-                    right_type=right_type,
-                    description=f"Data {right_type} clause found",
-                    user_control=user_control,
-                    citation_text=sentence,
-                    start_char=start,
-                    end_char=end
-                )
-                issues.append(issue)
+    return deduplicate_by_position(_scan(text, ("data",))["data"])
 
-    return deduplicate_by_position(issues)
 
-
-def assess_user_control(clause: str, right_type: str) -> str:
+def assess_user_control(clause: str, right_type: str, clause_lower: Optional[str] = None) -> str:
     """
     Assess how much control user has over their data
     Returns: "none", "limited", or "full"
-    """
-    clause_lower = clause.lower()
-
-    # Positive control indicators
-    positive_indicators = [
-        "you can",
-        "you may",
-        "right to",
-        "opt out",
-        "opt-out",
-        "choice",
-        "consent"
-    ]
 
-    # Negative control indicators
-    negative_indicators = [
-        "we may",
-        "without your consent",
-        "automatically",
-        "required",
-        "necessary for service"
-    ]
+    clause_lower: the clause already lowercased, if the caller has it
+    """
+    if clause_lower is None:
+        clause_lower = clause.lower()
 
-    has_positive = any(indicator in clause_lower for indicator in positive_indicators)
-    has_negative = any(indicator in clause_lower for indicator in negative_indicators)
+    has_positive = _POSITIVE_CONTROL_PATTERN.search(clause_lower) is not None
+    has_negative = _NEGATIVE_CONTROL_PATTERN.search(clause_lower) is not None
 
     if has_positive and not has_negative:
         return "full"
@@ -331,49 +527,71 @@ def detect_consumer_red_flags(text: str) -> List[Dict[str, Any]]:
     """
     Detect consumer protection red flags
     """
-    red_flags = []
-
-    for flag_type, keywords in CONSUMER_RED_FLAGS.items():
-        for keyword in keywords:
-            pattern = re.compile(
-                r'([^.!?]{0,200}' + re.escape(keyword) + r'[^.!?]{0,200}[.!?])',
-                re.IGNORECASE
-            )
-
-            for match in pattern.finditer(text):
-                red_flags.append({
-                    "type": flag_type,
-                    "text": match.group(1).strip(),
-                    "start": match.start(),
-                    "end": match.end()
-                })
-
-    return red_flags
+    return _scan(text, ("red_flag",))["red_flag"]
 
 
-def deduplicate_by_position(items: List) -> List:
+def deduplicate_by_position(items: List, already_sorted: bool = False) -> List:
     """
     Remove duplicate items based on overlapping positions
+
+    Single sweep over items ordered by start_char, comparing each item with
+    the furthest-reaching span kept so far. Pass already_sorted=True when
+    items are already in start_char order to skip the sort.
     """
     if not items:
         return items
 
     # Sort by start position
-    sorted_items = sorted(items, key=lambda x: x.start_char)
-
-    deduped = [sorted_items[0]]
+    sorted_items = items if already_sorted else sorted(items, key=lambda x: x.start_char)
 
-    for item in sorted_items[1:]:
-        last_item = deduped[-1]
+    deduped = []
+    max_end = None
 
-        # If positions don't overlap significantly, add it
-        overlap = min(last_item.end_char, item.end_char) - max(last_item.start_char, item.start_char)
-        if overlap < 50:  # Less than 50 char overlap
+    for item in sorted_items:
+        # Keep items that overlap the kept spans by less than 50 chars
+        if max_end is None or min(max_end, item.end_char) - item.start_char < 50:
             deduped.append(item)
+            if max_end is None or item.end_char > max_end:
+                max_end = item.end_char
 
     return deduped
 
 
+# Items rendered per summary section; totals always count every finding
+SUMMARY_MAX_ITEMS = 10
+SUMMARY_MAX_RED_FLAGS = 5
+
+
+def _power_imbalance_row(p: PowerImbalance) -> Dict[str, Any]:
+    """Summary row for one power imbalance"""
+    return {
+        "category": p.category,
+        "description": p.description,
+        "severity": p.severity,
+        "company_power": p.company_power,
+        "user_power": p.user_power,
+        "citation": {
+            "text": p.citation_text,
+            "start": p.start_char,
+            "end": p.end_char
+        }
+    }
+
+
+def _data_issue_row(d: DataRightIssue) -> Dict[str, Any]:
+    """Summary row for one data rights issue"""
+    return {
+        "type": d.right_type,
+        "description": d.description,
+        "user_control": d.user_control,
+        "citation": {
+            "text": d.citation_text,
+            "start": d.start_char,
+            "end": d.end_char
+        }
+    }
+
+
 def generate_policy_summary(
     text: str,
     doc_type: str,
@@ -383,18 +601,12 @@ def generate_policy_summary(
     Generate plain-language summary for ToS/Privacy Policy
     Focused on rights, risks, and power imbalances
     """
-    # Detect all issues
-    power_imbalances = detect_power_imbalances(text)
-    data_issues = detect_data_issues(text)
-    red_flags = detect_consumer_red_flags(text)
-
-    # Categorize by severity
-    high_risk_imbalances = [p for p in power_imbalances if p.severity == "high"]
-    medium_risk_imbalances = [p for p in power_imbalances if p.severity == "medium"]
+    # Detect all issues in one pass over the text
+    power_imbalances, data_issues, red_flags = analyze_policy(text)
 
-    # Data control assessment
-    no_control_data = [d for d in data_issues if d.user_control == "none"]
-    limited_control_data = [d for d in data_issues if d.user_control == "limited"]
+    # Count by severity and by data control level (only the top items are rendered)
+    severity_counts = Counter(p.severity for p in power_imbalances)
+    control_counts = Counter(d.user_control for d in data_issues)
 
     summary = {
         "doc_type": doc_type,
@@ -403,47 +615,27 @@ def generate_policy_summary(
 
         "power_imbalances": {
             "total": len(power_imbalances),
-            "high_severity": len(high_risk_imbalances),
-            "medium_severity": len(medium_risk_imbalances),
+            "high_severity": severity_counts["high"],
+            "medium_severity": severity_counts["medium"],
             "items": [
-                {
-                    "category": p.category,
-                    "description": p.description,
-                    "severity": p.severity,
-                    "company_power": p.company_power,
-                    "user_power": p.user_power,
-                    "citation": {
-                        "text": p.citation_text,
-                        "start": p.start_char,
-                        "end": p.end_char
-                    }
-                }
-                for p in power_imbalances[:10]  # Limit to top 10
+                _power_imbalance_row(p)
+                for p in islice(power_imbalances, SUMMARY_MAX_ITEMS)
             ]
         },
 
         "data_rights": {
             "total_issues": len(data_issues),
-            "no_control": len(no_control_data),
-            "limited_control": len(limited_control_data),
+            "no_control": control_counts["none"],
+            "limited_control": control_counts["limited"],
             "items": [
-                {
-                    "type": d.right_type,
-                    "description": d.description,
-                    "user_control": d.user_control,
-                    "citation": {
-                        "text": d.citation_text,
-                        "start": d.start_char,
-                        "end": d.end_char
-                    }
-                }
-                for d in data_issues[:10]
+                _data_issue_row(d)
+                for d in islice(data_issues, SUMMARY_MAX_ITEMS)
             ]
         },
 
         "consumer_red_flags": {
             "total": len(red_flags),
-            "items": red_flags[:5]  # Top 5
+            "items": list(islice(red_flags, SUMMARY_MAX_RED_FLAGS))
         },
 
         "key_takeaways": generate_key_takeaways(
@@ -1,14 +1,25 @@
 """
 Configuration management for LLUT backend
 """
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
-from pydantic_settings import BaseSettings
+from pydantic import Field, ValidationInfo, field_validator, model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
 
 class Settings(BaseSettings):
     """Application settings"""
 
+    model_config = SettingsConfigDict(
+        env_prefix="LLUT_",
+        case_sensitive=False,
+        frozen=True,
+    )
+
     # Application
     app_name: str = "LLUT"
     app_version: str = "0.1.0"
@@ -19,14 +30,14 @@ class Settings(BaseSettings):
     port: int = 8000
 
     # Paths
-    project_root: Path = Path(__file__).parent.parent.parent
-    app_data_dir: Path = project_root / "app_data"
-    cache_dir: Path = app_data_dir / "cache"
-    db_path: Path = app_data_dir / "llut.db"
-    settings_file: Path = app_data_dir / "settings.json"
+    project_root: Path = _PROJECT_ROOT
+    app_data_dir: Path = Field(default_factory=lambda: _PROJECT_ROOT / "app_data")
+    cache_dir: Path = Field(default_factory=lambda: _PROJECT_ROOT / "app_data" / "cache")
+    db_path: Path = Field(default_factory=lambda: _PROJECT_ROOT / "app_data" / "llut.db")
+    settings_file: Path = Field(default_factory=lambda: _PROJECT_ROOT / "app_data" / "settings.json")
 
     # Database
-    db_url: str = ""
+    db_url: str = Field(default="", validate_default=True)
 
     # Storage mode
     storage_mode: str = "full"  # full | thin | meta
@@ -37,20 +48,29 @@ class Settings(BaseSettings):
     # API Keys (loaded from settings.json)
     congress_api_key: Optional[str] = None
 
-    class Config:
-        env_prefix = "LLUT_"
-        case_sensitive = False
+    @field_validator("db_url", mode="after")
+    @classmethod
+    def _default_db_url(cls, value: str, info: ValidationInfo) -> str:
+        # Derive db_url from db_path unless set explicitly
+        if not value and "db_path" in info.data:
+            return f"sqlite:///{info.data['db_path']}"
+        return value
+
+    @model_validator(mode="after")
+    def _ensure_directories(self) -> "Settings":
+        # Ensure directories exist (skip the syscalls on warm starts)
+        for directory in (self.app_data_dir, self.cache_dir):
+            if not directory.exists():
+                directory.mkdir(parents=True, exist_ok=True)
+
+        return self
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        # Set db_url after initialization
-        if not self.db_url:
-            self.db_url = f"sqlite:///{self.db_path}"
 
-        # Ensure directories exist
-        self.app_data_dir.mkdir(parents=True, exist_ok=True)
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build the settings once per process"""
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -8,12 +8,11 @@ from .congress_gov import CongressGovConnector
 from .govinfo import GovInfoConnector
 from .scotus import ScotusConnector
 from .user_uploads import UserUploadsConnector
+from ..settings import settings_manager
 
 
 async def get_enabled_connectors() -> List[Connector]:
     """Get list of enabled connectors based on settings"""
-    from ..settings import settings_manager
-
     settings = settings_manager.load()
     sources = settings.get("sources", {})
 
@@ -2,13 +2,83 @@
 Base connector class
 All source connectors must inherit from this
 """
+import asyncio
+import hashlib
+import logging
+import uuid
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Callable
+from collections import OrderedDict
+from email.utils import formatdate
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 
+import httpx
+import orjson
 
-@dataclass
+try:
+    import ciso8601
+except ImportError:  # Optional; C ISO-8601 parser, datetime.fromisoformat otherwise
+    ciso8601 = None
+
+from ..db import db
+from .http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+
+# Shared read-only default for .get() on optional nested objects in payloads
+EMPTY_MAPPING = MappingProxyType({})
+
+# Last ETag per (source, listing), recorded only once a sync has stored that
+# listing's documents; least recently used entries are dropped past the cap
+MAX_LISTING_ETAGS = 256
+_LISTING_ETAGS: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+# Prefix for version content hashes; rows without it hold legacy bare SHA-256 digests
+CONTENT_HASH_PREFIX = "blake2b:"
+
+
+def compute_content_hash(text: Optional[str]) -> str:
+    """Content hash stored on each version (BLAKE2b-256 over the UTF-8 text)"""
+    digest = hashlib.blake2b((text or "").encode(), digest_size=32).hexdigest()
+    return CONTENT_HASH_PREFIX + digest
+
+
+# Payloads above this size are decoded off the event loop
+JSON_OFFLOAD_THRESHOLD = 64 * 1024
+
+
+async def decode_json_payload(raw: bytes) -> Any:
+    """Decode a connector's JSON payload, in a worker thread for large payloads"""
+    if len(raw) > JSON_OFFLOAD_THRESHOLD:
+        return await asyncio.to_thread(orjson.loads, raw)
+    return orjson.loads(raw)
+
+
+def dumps_json(obj: Any) -> str:
+    """Serialize a JSON column value (non-str keys such as page numbers allowed)"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def datetime_to_epoch(value: datetime) -> float:
+    """Seconds since the epoch (naive datetimes are taken as UTC)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def iso_to_epoch(value: str) -> float:
+    """Seconds since the epoch for an ISO-8601 date or datetime string"""
+    if ciso8601 is not None:
+        parsed = ciso8601.parse_datetime(value)
+    else:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return datetime_to_epoch(parsed)
+
+
+@dataclass(slots=True)
 class RemoteDocRef:
     """Reference to a remote document"""
     source_id: str
@@ -20,7 +90,7 @@ class RemoteDocRef:
     metadata: Dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedDoc:
     """Parsed document with versions"""
     document: Dict[str, Any]  # Document table fields
@@ -30,10 +100,16 @@ class ParsedDoc:
 class Connector(ABC):
     """Base class for source connectors"""
 
+    # Max in-flight HTTP requests to this source (stays under its rate limit)
+    MAX_CONCURRENT_REQUESTS = 5
+
     def __init__(self):
         self.source_id: str = ""
         self.source_name: str = ""
         self.base_url: str = ""
+        self._request_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        # ETags from this run's listings, saved by sync() once it succeeds
+        self._pending_etags: Dict[Tuple[str, str], str] = {}
 
     @abstractmethod
     async def list_updates(
@@ -73,6 +149,109 @@ class Connector(ABC):
         """Get canonical URL for a document"""
         return remote_ref.url
 
+    async def http_get(self, url: str, **kwargs) -> httpx.Response:
+        """GET through the shared client, capped at MAX_CONCURRENT_REQUESTS per connector"""
+        async with self._request_semaphore:
+            return await get_http_client().get(url, **kwargs)
+
+    async def http_download(self, url: str, max_bytes: int, **kwargs) -> bytes:
+        """
+        Stream a GET response body, giving up as soon as it exceeds max_bytes
+
+        Raises httpx.HTTPStatusError for error responses and ValueError when
+        the body (or its declared Content-Length) is over the limit.
+        """
+        async with self._request_semaphore:
+            async with get_http_client().stream("GET", url, **kwargs) as response:
+                response.raise_for_status()
+
+                declared = int(response.headers.get("Content-Length") or 0)
+                if declared > max_bytes:
+                    raise ValueError(f"Response too large: {declared} bytes (max {max_bytes})")
+
+                chunks = []
+                received = 0
+                async for chunk in response.aiter_bytes(65536):
+                    received += len(chunk)
+                    if received > max_bytes:
+                        raise ValueError(f"Response too large: over {max_bytes} bytes")
+                    chunks.append(chunk)
+
+                return b"".join(chunks)
+
+    async def http_get_listing(
+        self,
+        url: str,
+        since_date: Optional[datetime] = None,
+        params: Optional[Dict[str, Any]] = None,
+        etag_key: Optional[str] = None,
+        **kwargs
+    ) -> Optional[httpx.Response]:
+        """
+        Conditional GET for a listing endpoint
+
+        Sends If-Modified-Since (when since_date is given) and the ETag from
+        the last successful sync of the same listing. Returns None when the
+        server answers 304 Not Modified.
+
+        etag_key names the listing (e.g. a collection) when the URL itself
+        changes between polls; it defaults to the URL. A new ETag is only
+        kept for later polls once sync() completes.
+        """
+        cache_key = (self.source_id, etag_key or url)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if since_date is not None:
+            headers["If-Modified-Since"] = formatdate(datetime_to_epoch(since_date), usegmt=True)
+        etag = _LISTING_ETAGS.get(cache_key)
+        if etag:
+            headers["If-None-Match"] = etag
+
+        response = await self.http_get(url, params=params, headers=headers, **kwargs)
+        if response.status_code == 304:
+            return None
+
+        etag = response.headers.get("ETag")
+        if etag and response.is_success:
+            self._pending_etags[cache_key] = etag
+        return response
+
+    def _save_listing_etags(self):
+        """Keep this run's listing ETags for the next poll (after a successful sync)"""
+        for cache_key, etag in self._pending_etags.items():
+            _LISTING_ETAGS[cache_key] = etag
+            _LISTING_ETAGS.move_to_end(cache_key)
+        self._pending_etags.clear()
+
+        while len(_LISTING_ETAGS) > MAX_LISTING_ETAGS:
+            _LISTING_ETAGS.popitem(last=False)
+
+    # Stay well under SQLite's default host parameter limit
+    REMOTE_ID_LOOKUP_BATCH = 500
+
+    async def _load_remote_id_map(self, remote_ids: List[str]) -> Dict[str, str]:
+        """Map remote ids already recorded for this source to their document ids"""
+        known: Dict[str, str] = {}
+        unique_ids = list(dict.fromkeys(remote_ids))
+
+        for i in range(0, len(unique_ids), self.REMOTE_ID_LOOKUP_BATCH):
+            batch = unique_ids[i:i + self.REMOTE_ID_LOOKUP_BATCH]
+            placeholders = ", ".join("?" * len(batch))
+            rows = await db.fetch_all(
+                f"""
+                SELECT remote_id, document_id FROM document_remote_id
+                WHERE source_id = ? AND remote_id IN ({placeholders})
+                """,
+                (self.source_id, *batch)
+            )
+            for row in rows:
+                known[row["remote_id"]] = row["document_id"]
+
+        return known
+
+    # Concurrent fetch/parse pipelines per sync; database writes stay serialized
+    SYNC_CONCURRENCY = 8
+
     async def sync(
         self,
         progress_callback: Optional[Callable] = None
@@ -81,11 +260,6 @@ class Connector(ABC):
         Run sync process for this connector
         Fetches updates and stores them in database
         """
-        from ..db import db
-        import uuid
-        import json
-        import hashlib
-
         try:
             # Get last sync time
             source_row = await db.fetch_one(
@@ -103,41 +277,98 @@ class Connector(ABC):
             updates = await self.list_updates(since_ts)
 
             total = len(updates)
+
+            # Prefetch document ids for every listed remote id
+            known_docs = await self._load_remote_id_map(
+                [ref.remote_id for ref in updates]
+            )
             if progress_callback:
                 progress_callback("fetching", 0, total)
 
-            # Process each update
-            for idx, remote_ref in enumerate(updates):
+            # Network I/O runs concurrently; the shared SQLite connection
+            # only ever sees one writer at a time
+            fetch_semaphore = asyncio.Semaphore(self.SYNC_CONCURRENCY)
+            write_lock = asyncio.Lock()
+            processed = 0
+
+            async def _process_one(remote_ref: RemoteDocRef):
+                nonlocal processed
+
                 try:
-                    # Check if document already exists
-                    existing_doc = await db.fetch_one(
-                        """
-                        SELECT id FROM document
-                        WHERE source_id = ? AND identifiers_json LIKE ?
-                        """,
-                        (self.source_id, f'%"{remote_ref.remote_id}"%')
-                    )
-
-                    # Fetch document content
-                    raw_content = await self.fetch_doc(remote_ref)
-
-                    # Parse document
-                    parsed = await self.parse_payload(raw_content, remote_ref)
-
-                    # Store or update document
-                    if existing_doc:
-                        doc_id = existing_doc["id"]
-                    else:
-                        doc_id = str(uuid.uuid4())
+                    async with fetch_semaphore:
+                        # Fetch document content
+                        raw_content = await self.fetch_doc(remote_ref)
+
+                        # Parse document
+                        parsed = await self.parse_payload(raw_content, remote_ref)
+                except Exception:
+                    logger.exception("Error processing %s", remote_ref.remote_id)
+                    parsed = None
+
+                async with write_lock:
+                    try:
+                        if parsed is not None:
+                            await _store_one(remote_ref, parsed)
+                    except Exception:
+                        logger.exception("Error processing %s", remote_ref.remote_id)
+
+                    # Update progress
+                    processed += 1
+                    if progress_callback:
+                        progress_callback("fetching", processed, total)
+
+            async def _store_one(remote_ref: RemoteDocRef, parsed: ParsedDoc):
+                # Check if document already exists (migration 007 mapped
+                # documents synced before the mapping table existed)
+                existing_id = known_docs.get(remote_ref.remote_id)
+                existing_doc = existing_id is not None
+
+                # Build version and change_event rows, then write the
+                # document and all of its versions in one transaction
+                version_rows = []
+                change_rows = []
+                doc_id = existing_id or uuid.uuid4().hex
+
+                # One timestamp for the document and everything stored with it
+                now_iso = datetime.utcnow().isoformat()
+
+                for version_data in parsed.versions:
+                    version_id = uuid.uuid4().hex
+
+                    # Calculate content hash
+                    content_hash = compute_content_hash(version_data.get("normalized_text"))
+
+                    version_rows.append((
+                        version_id,
+                        doc_id,
+                        version_data.get("version_label", "default"),
+                        version_data.get("published_ts"),
+                        now_iso,
+                        version_data.get("content_mode", "full"),
+                        content_hash,
+                        version_data.get("normalized_text"),
+                        version_data.get("outline_json"),
+                        version_data.get("snippets_json"),
+                        version_data.get("parse_warnings_json"),
+                        version_data.get("page_map_json"),
+                        version_data.get("confidence_score", 1.0)
+                    ))
+
+                    # Change event for this version
+                    change_rows.append((
+                        uuid.uuid4().hex,
+                        doc_id,
+                        version_id,
+                        "new_version" if existing_doc else "new_doc",
+                        f"Added {version_data.get('version_label', 'version')}",
+                        now_iso
+                    ))
+
+                async with db.transaction():
+                    # Store new document
+                    if not existing_doc:
                         await db.execute(
-                            """
-                            INSERT INTO document (
-                                id, source_id, jurisdiction, doc_type,
-                                title, identifiers_json, canonical_url,
-                                first_seen_ts, last_seen_ts,
-                                is_user_uploaded, original_filename, upload_mime, source_path
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                            """,
+                            db.DOCUMENT_INSERT_SQL,
                             (
                                 doc_id,
                                 parsed.document["source_id"],
@@ -146,8 +377,8 @@ class Connector(ABC):
                                 parsed.document.get("title"),
                                 parsed.document.get("identifiers_json"),
                                 parsed.document.get("canonical_url"),
-                                datetime.utcnow().isoformat(),
-                                datetime.utcnow().isoformat(),
+                                now_iso,
+                                now_iso,
                                 parsed.document.get("is_user_uploaded", False),
                                 parsed.document.get("original_filename"),
                                 parsed.document.get("upload_mime"),
@@ -155,73 +386,36 @@ class Connector(ABC):
                             )
                         )
 
-                    # Store versions
-                    for version_data in parsed.versions:
-                        version_id = str(uuid.uuid4())
-
-                        # Calculate content hash
-                        content_hash = hashlib.sha256(
-                            (version_data.get("normalized_text") or "").encode()
-                        ).hexdigest()
-
+                    if not existing_doc:
                         await db.execute(
                             """
-                            INSERT INTO version (
-                                id, document_id, version_label, published_ts,
-                                fetched_ts, content_mode, content_hash,
-                                normalized_text, outline_json, snippets_json,
-                                parse_warnings_json, page_map_json, confidence_score
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                            INSERT OR IGNORE INTO document_remote_id (
+                                source_id, remote_id, document_id
+                            ) VALUES (?, ?, ?)
                             """,
-                            (
-                                version_id,
-                                doc_id,
-                                version_data.get("version_label", "default"),
-                                version_data.get("published_ts"),
-                                datetime.utcnow().isoformat(),
-                                version_data.get("content_mode", "full"),
-                                content_hash,
-                                version_data.get("normalized_text"),
-                                version_data.get("outline_json"),
-                                version_data.get("snippets_json"),
-                                version_data.get("parse_warnings_json"),
-                                version_data.get("page_map_json"),
-                                version_data.get("confidence_score", 1.0)
-                            )
+                            (self.source_id, remote_ref.remote_id, doc_id)
                         )
 
-                        # Create change event
-                        change_id = str(uuid.uuid4())
-                        await db.execute(
-                            """
-                            INSERT INTO change_event (
-                                id, document_id, new_version_id,
-                                change_type, summary, created_ts
-                            ) VALUES (?, ?, ?, ?, ?, ?)
-                            """,
-                            (
-                                change_id,
-                                doc_id,
-                                version_id,
-                                "new_version" if existing_doc else "new_doc",
-                                f"Added {version_data.get('version_label', 'version')}",
-                                datetime.utcnow().isoformat()
-                            )
-                        )
+                    # Store versions and their change events
+                    if version_rows:
+                        await db.execute_many(db.VERSION_INSERT_SQL, version_rows)
+                        await db.execute_many(db.CHANGE_EVENT_INSERT_SQL, change_rows)
 
-                except Exception as e:
-                    print(f"Error processing {remote_ref.remote_id}: {e}")
-                    continue
+                known_docs[remote_ref.remote_id] = doc_id
 
-                # Update progress
-                if progress_callback:
-                    progress_callback("fetching", idx + 1, total)
+            # Process each update
+            tasks = [
+                asyncio.create_task(_process_one(remote_ref))
+                for remote_ref in updates
+            ]
+            await asyncio.gather(*tasks, return_exceptions=True)
 
             # Update last sync time
             await db.execute(
                 "UPDATE source SET last_sync_ts = ? WHERE id = ?",
                 (datetime.utcnow().isoformat(), self.source_id)
             )
+            self._save_listing_etags()
 
             if progress_callback:
                 progress_callback("completed", total, total)
@@ -2,12 +2,15 @@
 Congress.gov connector
 Fetches bills and legislative actions
 """
-import httpx
-import json
+import logging
 from typing import List, Optional
 from datetime import datetime, timedelta
+import orjson
 
-from .base import Connector, RemoteDocRef, ParsedDoc
+from .base import Connector, RemoteDocRef, ParsedDoc, EMPTY_MAPPING, datetime_to_epoch, decode_json_payload, dumps_json, iso_to_epoch
+from ..settings import settings_manager
+
+logger = logging.getLogger(__name__)
 
 
 class CongressGovConnector(Connector):
@@ -19,10 +22,11 @@ class CongressGovConnector(Connector):
         self.source_name = "Congress.gov"
         self.base_url = "https://api.congress.gov/v3"
 
+        # Connectors are built per sync, so the key is read once per run
+        self._api_key = self._get_api_key()
+
     def _get_api_key(self) -> Optional[str]:
         """Get API key from settings"""
-        from ..settings import settings_manager
-
         settings = settings_manager.load()
         return settings.get("sources", {}).get("congress_gov", {}).get("api_key")
 
@@ -33,88 +37,97 @@ class CongressGovConnector(Connector):
         """
         List bills with recent actions
         """
-        api_key = self._get_api_key()
+        api_key = self._api_key
 
         if not api_key:
-            print("Congress.gov API key not configured. Skipping.")
+            logger.info("Congress.gov API key not configured. Skipping.")
             return []
 
         updates = []
 
+        # One clock read per listing
+        now = datetime.utcnow()
+        now_iso = now.isoformat()
+
         # Default to last 30 days if no timestamp provided
         if since_ts:
             try:
                 since_date = datetime.fromisoformat(since_ts.replace('Z', '+00:00'))
             except:
-                since_date = datetime.utcnow() - timedelta(days=30)
+                since_date = now - timedelta(days=30)
         else:
-            since_date = datetime.utcnow() - timedelta(days=30)
+            since_date = now - timedelta(days=30)
 
         # Format date for API (YYYY-MM-DD)
         since_str = since_date.strftime("%Y-%m-%d")
 
+        # Compare bill update times as epoch seconds
+        since_epoch = datetime_to_epoch(since_date)
+
         # Get current congress number (118th Congress started Jan 2023)
         # Simple calculation: (current_year - 1789) / 2
-        current_congress = (datetime.now().year - 1789) // 2 + 1
+        current_congress = (now.year - 1789) // 2 + 1
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                # Query bills from current congress
-                params = {
-                    "api_key": api_key,
-                    "format": "json",
-                    "limit": 50,
-                    "offset": 0
-                }
-
-                response = await client.get(
-                    f"{self.base_url}/bill/{current_congress}",
-                    params=params
-                )
-                response.raise_for_status()
-                data = response.json()
-
-                bills = data.get("bills", [])
-
-                for bill in bills:
-                    # Get bill details
-                    bill_number = bill.get("number", "")
-                    bill_type = bill.get("type", "")
-                    bill_title = bill.get("title", "Unknown Bill")
-
-                    # Check if there are recent updates
-                    update_date = bill.get("updateDate", bill.get("introducedDate", ""))
-
-                    if update_date:
-                        try:
-                            update_dt = datetime.fromisoformat(update_date.replace('Z', '+00:00'))
-                            if update_dt < since_date:
-                                continue
-                        except:
-                            pass
-
-                    # Get bill URL
-                    bill_url = f"https://www.congress.gov/bill/{current_congress}th-congress/{bill_type.lower()}-bill/{bill_number}"
-
-                    updates.append(RemoteDocRef(
-                        source_id=self.source_id,
-                        remote_id=f"{current_congress}-{bill_type}-{bill_number}",
-                        doc_type="bill",
-                        title=bill_title,
-                        url=bill_url,
-                        published_ts=update_date or datetime.utcnow().isoformat(),
-                        metadata={
-                            "congress": current_congress,
-                            "bill_type": bill_type,
-                            "bill_number": bill_number,
-                            "introduced_date": bill.get("introducedDate"),
-                            "update_date": update_date,
-                            "api_url": bill.get("url")
-                        }
-                    ))
-
-            except Exception as e:
-                print(f"Error listing Congress.gov bills: {e}")
+        try:
+            # Query bills from current congress
+            params = {
+                "api_key": api_key,
+                "format": "json",
+                "limit": 50,
+                "offset": 0
+            }
+
+            response = await self.http_get_listing(
+                f"{self.base_url}/bill/{current_congress}",
+                since_date=since_date if since_ts else None,
+                params=params
+            )
+            if response is None:
+                # Not modified since the last poll
+                return []
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+
+            bills = data.get("bills", ())
+
+            for bill in bills:
+                # Get bill details
+                bill_number = bill.get("number", "")
+                bill_type = bill.get("type", "")
+                bill_title = bill.get("title", "Unknown Bill")
+
+                # Check if there are recent updates
+                update_date = bill.get("updateDate", bill.get("introducedDate", ""))
+
+                if update_date:
+                    try:
+                        if iso_to_epoch(update_date) < since_epoch:
+                            continue
+                    except ValueError:
+                        pass
+
+                # Get bill URL
+                bill_url = f"https://www.congress.gov/bill/{current_congress}th-congress/{bill_type.lower()}-bill/{bill_number}"
+
+                updates.append(RemoteDocRef(
+                    source_id=self.source_id,
+                    remote_id=f"{current_congress}-{bill_type}-{bill_number}",
+                    doc_type="bill",
+                    title=bill_title,
+                    url=bill_url,
+                    published_ts=update_date or now_iso,
+                    metadata={
+                        "congress": current_congress,
+                        "bill_type": bill_type,
+                        "bill_number": bill_number,
+                        "introduced_date": bill.get("introducedDate"),
+                        "update_date": update_date,
+                        "api_url": bill.get("url")
+                    }
+                ))
+
+        except Exception:
+            logger.exception("Error listing Congress.gov bills")
 
         return updates[:30]  # Limit for MVP
 
@@ -125,7 +138,7 @@ class CongressGovConnector(Connector):
         """
         Fetch bill details from API
         """
-        api_key = self._get_api_key()
+        api_key = self._api_key
 
         if not api_key:
             raise Exception("Congress.gov API key not configured")
@@ -140,20 +153,19 @@ class CongressGovConnector(Connector):
             bill_number = remote_ref.metadata.get("bill_number")
             api_url = f"{self.base_url}/bill/{congress}/{bill_type}/{bill_number}"
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                params = {
-                    "api_key": api_key,
-                    "format": "json"
-                }
+        try:
+            params = {
+                "api_key": api_key,
+                "format": "json"
+            }
 
-                response = await client.get(api_url, params=params)
-                response.raise_for_status()
-                return response.content
+            response = await self.http_get(api_url, params=params)
+            response.raise_for_status()
+            return response.content
 
-            except Exception as e:
-                print(f"Error fetching bill {remote_ref.remote_id}: {e}")
-                raise
+        except Exception as e:
+            logger.error("Error fetching bill %s: %s", remote_ref.remote_id, e)
+            raise
 
     async def parse_payload(
         self,
@@ -164,8 +176,8 @@ class CongressGovConnector(Connector):
         Parse Congress.gov API response
         """
         try:
-            data = json.loads(raw.decode('utf-8'))
-            bill_data = data.get("bill", {})
+            data = await decode_json_payload(raw)
+            bill_data = data.get("bill", EMPTY_MAPPING)
 
             # Extract document fields
             doc_data = {
@@ -173,7 +185,7 @@ class CongressGovConnector(Connector):
                 "jurisdiction": "US-FED",
                 "doc_type": "bill",
                 "title": bill_data.get("title", remote_ref.title),
-                "identifiers_json": json.dumps({
+                "identifiers_json": dumps_json({
                     "congress": remote_ref.metadata.get("congress"),
                     "bill_type": remote_ref.metadata.get("bill_type"),
                     "bill_number": remote_ref.metadata.get("bill_number")
@@ -182,8 +194,8 @@ class CongressGovConnector(Connector):
             }
 
             # Extract summary and text
-            summary = bill_data.get("summary", {}).get("text", "")
-            actions = bill_data.get("actions", {})
+            summary = bill_data.get("summary", EMPTY_MAPPING).get("text", "")
+            actions = bill_data.get("actions", EMPTY_MAPPING)
 
             # Create outline from actions
             outline = {
@@ -191,32 +203,36 @@ class CongressGovConnector(Connector):
                 "sections": []
             }
 
-            # Add action items to outline
-            action_items = actions.get("items", []) if isinstance(actions, dict) else []
-            for action in action_items[:10]:  # Limit to first 10 actions
-                outline["sections"].append({
-                    "date": action.get("actionDate", ""),
-                    "text": action.get("text", "")[:200]
-                })
-
-            # Create normalized text
-            normalized_text = f"{bill_data.get('title', '')}\n\n"
+            # Normalized text header
+            text_parts = [f"{bill_data.get('title', '')}\n\n"]
             if summary:
-                normalized_text += f"Summary:\n{summary}\n\n"
+                text_parts.append(f"Summary:\n{summary}\n\n")
 
-            # Add recent actions
+            # One pass over the actions: first 10 go in the outline,
+            # first 5 are listed as recent actions in the text
+            action_items = actions.get("items", ()) if isinstance(actions, dict) else ()
             if action_items:
-                normalized_text += "Recent Actions:\n"
-                for action in action_items[:5]:
-                    normalized_text += f"- {action.get('actionDate', '')}: {action.get('text', '')}\n"
+                text_parts.append("Recent Actions:\n")
+
+            for i, action in enumerate(action_items[:10]):
+                action_date = action.get("actionDate", "")
+                action_text = action.get("text", "")
+                outline["sections"].append({
+                    "date": action_date,
+                    "text": action_text[:200]
+                })
+                if i < 5:
+                    text_parts.append(f"- {action_date}: {action_text}\n")
+
+            normalized_text = "".join(text_parts)
 
             # Create version data
             version_data = {
                 "version_label": "current",
                 "published_ts": remote_ref.published_ts,
                 "normalized_text": normalized_text,
-                "outline_json": json.dumps(outline),
-                "snippets_json": json.dumps({
+                "outline_json": dumps_json(outline),
+                "snippets_json": dumps_json({
                     "summary": summary[:500] if summary else "",
                     "title": bill_data.get("title", "")[:300]
                 }),
@@ -229,5 +245,5 @@ class CongressGovConnector(Connector):
             )
 
         except Exception as e:
-            print(f"Error parsing bill: {e}")
+            logger.error("Error parsing bill: %s", e)
             raise
@@ -2,12 +2,16 @@
 Federal Register connector
 Fetches Executive Orders and other presidential documents
 """
-import httpx
-import json
-from typing import List, Optional
+import asyncio
+import logging
+import math
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
+import orjson
 
-from .base import Connector, RemoteDocRef, ParsedDoc
+from .base import Connector, RemoteDocRef, ParsedDoc, EMPTY_MAPPING, decode_json_payload, dumps_json
+
+logger = logging.getLogger(__name__)
 
 
 class FederalRegisterConnector(Connector):
@@ -45,55 +49,77 @@ class FederalRegisterConnector(Connector):
             "conditions[type][]": "PRESDOCU",
             "conditions[presidential_document_type][]": "executive_order",
             "conditions[publication_date][gte]": since_str,
-            "per_page": 100,
-            "page": 1
+            "per_page": 100
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            while True:
-                try:
-                    response = await client.get(
-                        f"{self.base_url}/documents.json",
-                        params=params
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-
-                    results = data.get("results", [])
-                    if not results:
-                        break
-
-                    for doc in results:
-                        updates.append(RemoteDocRef(
-                            source_id=self.source_id,
-                            remote_id=doc.get("document_number", ""),
-                            doc_type="executive_order",
-                            title=doc.get("title", ""),
-                            url=doc.get("html_url", ""),
-                            published_ts=doc.get("publication_date", ""),
-                            metadata={
-                                "executive_order_number": doc.get("executive_order_number"),
-                                "signing_date": doc.get("signing_date"),
-                                "president": doc.get("president", {}).get("identifier"),
-                                "abstract": doc.get("abstract"),
-                                "pdf_url": doc.get("pdf_url"),
-                                "json_url": doc.get("json_url")
-                            }
-                        ))
-
-                    # Check if there are more pages
-                    if len(results) < params["per_page"]:
-                        break
-
-                    params["page"] += 1
-
-                except Exception as e:
-                    print(f"Error listing Federal Register documents: {e}")
-                    break
+        url = f"{self.base_url}/documents.json"
+
+        try:
+            # First page reports how many pages there are; nothing to do
+            # if it is unchanged since the last poll
+            response = await self.http_get_listing(
+                url,
+                since_date=since_date if since_ts else None,
+                params={**params, "page": 1}
+            )
+            if response is None:
+                return []
+            response.raise_for_status()
+            first_page = orjson.loads(response.content)
+        except Exception:
+            logger.exception("Error listing Federal Register documents")
+            return []
+
+        pages = [first_page.get("results", ())]
+        total_pages = first_page.get("total_pages") or math.ceil(
+            first_page.get("count", 0) / params["per_page"]
+        )
+
+        # Fetch the remaining pages concurrently (http_get caps requests in flight)
+        if pages[0] and total_pages > 1:
+            rest = await asyncio.gather(
+                *(self._fetch_page(url, params, page) for page in range(2, total_pages + 1)),
+                return_exceptions=True
+            )
+            for data in rest:
+                if isinstance(data, Exception):
+                    logger.error("Error listing Federal Register documents: %s", data)
+                    continue
+                pages.append(data.get("results", ()))
+
+        for results in pages:
+            for doc in results:
+                updates.append(RemoteDocRef(
+                    source_id=self.source_id,
+                    remote_id=doc.get("document_number", ""),
+                    doc_type="executive_order",
+                    title=doc.get("title", ""),
+                    url=doc.get("html_url", ""),
+                    published_ts=doc.get("publication_date", ""),
+                    metadata={
+                        "executive_order_number": doc.get("executive_order_number"),
+                        "signing_date": doc.get("signing_date"),
+                        "president": doc.get("president", EMPTY_MAPPING).get("identifier"),
+                        "abstract": doc.get("abstract"),
+                        "pdf_url": doc.get("pdf_url"),
+                        "json_url": doc.get("json_url")
+                    }
+                ))
 
         # Limit to 10 for MVP testing
         return updates[:10]
 
+    async def _fetch_page(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        page: int
+    ) -> Dict[str, Any]:
+        """Fetch one page of document search results"""
+        response = await self.http_get(url, params={**params, "page": page})
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
     async def fetch_doc(
         self,
         remote_ref: RemoteDocRef
@@ -108,15 +134,14 @@ class FederalRegisterConnector(Connector):
             # Fallback to constructing URL
             json_url = f"{self.base_url}/documents/{remote_ref.remote_id}.json"
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(json_url)
-                response.raise_for_status()
-                return response.content
+        try:
+            response = await self.http_get(json_url)
+            response.raise_for_status()
+            return response.content
 
-            except Exception as e:
-                print(f"Error fetching document {remote_ref.remote_id}: {e}")
-                raise
+        except Exception as e:
+            logger.error("Error fetching document %s: %s", remote_ref.remote_id, e)
+            raise
 
     async def parse_payload(
         self,
@@ -127,7 +152,7 @@ class FederalRegisterConnector(Connector):
         Parse Federal Register JSON response
         """
         try:
-            data = json.loads(raw.decode('utf-8'))
+            data = await decode_json_payload(raw)
 
             # Handle both single document and wrapped responses
             if "results" in data and isinstance(data["results"], list) and len(data["results"]) > 0:
@@ -141,7 +166,7 @@ class FederalRegisterConnector(Connector):
                 "jurisdiction": "US-FED",
                 "doc_type": "executive_order",
                 "title": data.get("title", remote_ref.title),
-                "identifiers_json": json.dumps({
+                "identifiers_json": dumps_json({
                     "document_number": data.get("document_number", remote_ref.remote_id),
                     "executive_order_number": data.get("executive_order_number")
                 }),
@@ -175,8 +200,8 @@ class FederalRegisterConnector(Connector):
                 "version_label": "published",
                 "published_ts": data.get("publication_date", "") or data.get("signing_date", ""),
                 "normalized_text": normalized_text,
-                "outline_json": json.dumps(outline),
-                "snippets_json": json.dumps({
+                "outline_json": dumps_json(outline),
+                "snippets_json": dumps_json({
                     "abstract": (data.get("abstract") or "")[:500],
                     "executive_order_number": data.get("executive_order_number", ""),
                     "citation": data.get("citation", "")
@@ -190,5 +215,5 @@ class FederalRegisterConnector(Connector):
             )
 
         except Exception as e:
-            print(f"Error parsing document: {e}")
+            logger.error("Error parsing document: %s", e)
             raise
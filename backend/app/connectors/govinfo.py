@@ -2,27 +2,39 @@
 GovInfo connector
 Fetches GPO published documents
 """
-import httpx
-import json
+import asyncio
+import logging
 from typing import List, Optional
 from datetime import datetime, timedelta
+import orjson
 
-from .base import Connector, RemoteDocRef, ParsedDoc
+from .base import Connector, RemoteDocRef, ParsedDoc, decode_json_payload, dumps_json
+from ..settings import settings_manager
+
+logger = logging.getLogger(__name__)
 
 
 class GovInfoConnector(Connector):
     """Connector for GovInfo (GPO) API"""
 
+    MAX_CONCURRENT_REQUESTS = 10
+    UNAUTHENTICATED_CONCURRENT_REQUESTS = 2
+
     def __init__(self):
         super().__init__()
         self.source_id = "govinfo"
         self.source_name = "GovInfo"
         self.base_url = "https://api.govinfo.gov"
 
+        # Connectors are built per sync, so the key is read once per run
+        self._api_key = self._get_api_key()
+
+        # Public access without a key is rate limited much harder
+        if not self._api_key:
+            self._request_semaphore = asyncio.Semaphore(self.UNAUTHENTICATED_CONCURRENT_REQUESTS)
+
     def _get_api_key(self) -> Optional[str]:
         """Get API key from settings"""
-        from ..settings import settings_manager
-
         settings = settings_manager.load()
         return settings.get("sources", {}).get("govinfo", {}).get("api_key")
 
@@ -34,12 +46,12 @@ class GovInfoConnector(Connector):
         List recent publications from GovInfo
         Focuses on collections relevant to legal updates
         """
-        api_key = self._get_api_key()
+        api_key = self._api_key
 
         # GovInfo API can work without an API key for basic access
         # but with rate limits. API key is recommended.
         if not api_key:
-            print("Warning: GovInfo API key not configured. Using public access with rate limits.")
+            logger.warning("GovInfo API key not configured. Using public access with rate limits.")
 
         updates = []
 
@@ -52,9 +64,8 @@ class GovInfoConnector(Connector):
         else:
             since_date = datetime.utcnow() - timedelta(days=30)
 
-        # Format dates for API
+        # Format date for API
         start_date = since_date.strftime("%Y-%m-%d")
-        end_date = datetime.utcnow().strftime("%Y-%m-%d")
 
         # Collections to query (focusing on legal documents)
         collections = [
@@ -64,67 +75,91 @@ class GovInfoConnector(Connector):
             "STATUTE",  # US Statutes at Large
         ]
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for collection in collections:
-                try:
-                    # Build request URL
-                    url = f"{self.base_url}/collections/{collection}/{start_date}"
+        # Query all collections concurrently
+        results = await asyncio.gather(*(
+            self._fetch_collection(collection, start_date, since_date if since_ts else None, api_key)
+            for collection in collections
+        ))
+        for collection_updates in results:
+            updates.extend(collection_updates)
+
+        return updates[:50]  # Limit for MVP
+
+    async def _fetch_collection(
+        self,
+        collection: str,
+        start_date: str,
+        since_date: Optional[datetime],
+        api_key: Optional[str]
+    ) -> List[RemoteDocRef]:
+        """List packages published in one collection since start_date"""
+        updates = []
+        now_iso = datetime.utcnow().isoformat()
+
+        try:
+            # Build request URL
+            url = f"{self.base_url}/collections/{collection}/{start_date}"
+
+            params = {
+                "offset": 0,
+                "pageSize": 20
+            }
+
+            if api_key:
+                params["api_key"] = api_key
+
+            # The URL carries start_date, so the ETag is tracked per collection
+            response = await self.http_get_listing(
+                url, since_date=since_date, params=params, etag_key=collection
+            )
 
-                    params = {
-                        "offset": 0,
-                        "pageSize": 20
+            # Skip if collection unchanged, not available or rate limited
+            if response is None:
+                return []
+            if response.status_code == 404:
+                return []
+            if response.status_code == 429:
+                logger.warning("Rate limited on collection %s", collection)
+                return []
+
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+
+            # Parse packages
+            packages = data.get("packages", ())
+
+            for package in packages:
+                package_id = package.get("packageId", "")
+                title = package.get("title", "Untitled Document")
+                doc_class = package.get("docClass", collection)
+
+                # Get package date
+                date_issued = package.get("dateIssued", now_iso)
+
+                # Build URL
+                doc_url = f"https://www.govinfo.gov/app/details/{package_id}"
+
+                updates.append(RemoteDocRef(
+                    source_id=self.source_id,
+                    remote_id=package_id,
+                    doc_type=doc_class.lower(),
+                    title=title,
+                    url=doc_url,
+                    published_ts=date_issued,
+                    metadata={
+                        "package_id": package_id,
+                        "collection": collection,
+                        "doc_class": doc_class,
+                        "date_issued": date_issued,
+                        "granule_count": package.get("granuleCount", 0)
                     }
+                ))
 
-                    if api_key:
-                        params["api_key"] = api_key
-
-                    response = await client.get(url, params=params)
-
-                    # Skip if collection not available or rate limited
-                    if response.status_code == 404:
-                        continue
-                    if response.status_code == 429:
-                        print(f"Rate limited on collection {collection}")
-                        continue
-
-                    response.raise_for_status()
-                    data = response.json()
-
-                    # Parse packages
-                    packages = data.get("packages", [])
-
-                    for package in packages:
-                        package_id = package.get("packageId", "")
-                        title = package.get("title", "Untitled Document")
-                        doc_class = package.get("docClass", collection)
-
-                        # Get package date
-                        date_issued = package.get("dateIssued", datetime.utcnow().isoformat())
-
-                        # Build URL
-                        doc_url = f"https://www.govinfo.gov/app/details/{package_id}"
-
-                        updates.append(RemoteDocRef(
-                            source_id=self.source_id,
-                            remote_id=package_id,
-                            doc_type=doc_class.lower(),
-                            title=title,
-                            url=doc_url,
-                            published_ts=date_issued,
-                            metadata={
-                                "package_id": package_id,
-                                "collection": collection,
-                                "doc_class": doc_class,
-                                "date_issued": date_issued,
-                                "granule_count": package.get("granuleCount", 0)
-                            }
-                        ))
-
-                except Exception as e:
-                    print(f"Error querying GovInfo collection {collection}: {e}")
-                    continue
+            return updates
 
-        return updates[:50]  # Limit for MVP
+        except Exception:
+            logger.exception("Error querying GovInfo collection %s", collection)
+            return []
 
     async def fetch_doc(
         self,
@@ -133,25 +168,24 @@ class GovInfoConnector(Connector):
         """
         Fetch package summary from GovInfo API
         """
-        api_key = self._get_api_key()
+        api_key = self._api_key
         package_id = remote_ref.metadata.get("package_id", remote_ref.remote_id)
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                # Get package summary
-                url = f"{self.base_url}/packages/{package_id}/summary"
+        try:
+            # Get package summary
+            url = f"{self.base_url}/packages/{package_id}/summary"
 
-                params = {}
-                if api_key:
-                    params["api_key"] = api_key
+            params = {}
+            if api_key:
+                params["api_key"] = api_key
 
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                return response.content
+            response = await self.http_get(url, params=params)
+            response.raise_for_status()
+            return response.content
 
-            except Exception as e:
-                print(f"Error fetching package {package_id}: {e}")
-                raise
+        except Exception as e:
+            logger.error("Error fetching package %s: %s", package_id, e)
+            raise
 
     async def parse_payload(
         self,
@@ -162,7 +196,7 @@ class GovInfoConnector(Connector):
         Parse GovInfo package summary
         """
         try:
-            data = json.loads(raw.decode('utf-8'))
+            data = await decode_json_payload(raw)
 
             # Extract document fields
             doc_data = {
@@ -170,7 +204,7 @@ class GovInfoConnector(Connector):
                 "jurisdiction": "US-FED",
                 "doc_type": remote_ref.metadata.get("doc_class", "govinfo_doc").lower(),
                 "title": data.get("title", remote_ref.title),
-                "identifiers_json": json.dumps({
+                "identifiers_json": dumps_json({
                     "package_id": remote_ref.metadata.get("package_id"),
                     "collection": remote_ref.metadata.get("collection")
                 }),
@@ -189,7 +223,7 @@ class GovInfoConnector(Connector):
             }
 
             # Check for granules (sections/parts)
-            granules = data.get("granules", [])
+            granules = data.get("granules", ())
             if granules:
                 for granule in granules[:20]:  # Limit to first 20
                     outline["sections"].append({
@@ -198,28 +232,30 @@ class GovInfoConnector(Connector):
                     })
 
             # Create normalized text
-            normalized_text = f"{data.get('title', '')}\n\n"
+            text_parts = [f"{data.get('title', '')}\n\n"]
 
             if abstract:
-                normalized_text += f"Abstract:\n{abstract}\n\n"
+                text_parts.append(f"Abstract:\n{abstract}\n\n")
 
             if summary:
-                normalized_text += f"Summary:\n{summary}\n\n"
+                text_parts.append(f"Summary:\n{summary}\n\n")
 
             # Add document details
             if data.get("dateIssued"):
-                normalized_text += f"Date Issued: {data.get('dateIssued')}\n"
+                text_parts.append(f"Date Issued: {data.get('dateIssued')}\n")
 
             if data.get("congress"):
-                normalized_text += f"Congress: {data.get('congress')}\n"
+                text_parts.append(f"Congress: {data.get('congress')}\n")
+
+            normalized_text = "".join(text_parts)
 
             # Create version data
             version_data = {
                 "version_label": "published",
                 "published_ts": remote_ref.metadata.get("date_issued", remote_ref.published_ts),
                 "normalized_text": normalized_text,
-                "outline_json": json.dumps(outline),
-                "snippets_json": json.dumps({
+                "outline_json": dumps_json(outline),
+                "snippets_json": dumps_json({
                     "abstract": abstract[:500] if abstract else "",
                     "summary": summary[:500] if summary else ""
                 }),
@@ -232,5 +268,5 @@ class GovInfoConnector(Connector):
             )
 
         except Exception as e:
-            print(f"Error parsing GovInfo package: {e}")
+            logger.error("Error parsing GovInfo package: %s", e)
             raise
@@ -0,0 +1,60 @@
+"""
+Shared HTTP client for source connectors
+One pooled keep-alive client instead of a new client (and TLS handshake) per request
+"""
+import asyncio
+from typing import Iterable, Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:  # Optional; install httpx[http2] to multiplex requests per host
+    HTTP2_AVAILABLE = False
+
+
+HTTP_LIMITS = httpx.Limits(max_connections=1000, max_keepalive_connections=100)
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+# Retries for failed connection attempts (httpx does not retry on status codes)
+HTTP_CONNECT_RETRIES = 3
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared client, creating it on first use (or after close)"""
+    global _client
+
+    if _client is None or _client.is_closed:
+        transport = httpx.AsyncHTTPTransport(
+            http2=HTTP2_AVAILABLE,
+            limits=HTTP_LIMITS,
+            retries=HTTP_CONNECT_RETRIES
+        )
+        _client = httpx.AsyncClient(transport=transport, timeout=HTTP_TIMEOUT)
+
+    return _client
+
+
+async def close_http_client():
+    """Close the shared client (app shutdown)"""
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def warmup_http_client(urls: Iterable[str]):
+    """
+    Open pooled connections to the given hosts ahead of the first sync
+
+    Pays DNS lookup and TLS handshake up front; failures (e.g. offline) are ignored.
+    """
+    client = get_http_client()
+    await asyncio.gather(
+        *(client.head(url, timeout=10.0) for url in urls),
+        return_exceptions=True
+    )
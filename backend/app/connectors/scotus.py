@@ -2,13 +2,22 @@
 Supreme Court connector
 Fetches Supreme Court opinions
 """
-import httpx
-import json
+import logging
 from typing import List, Optional
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 
-from .base import Connector, RemoteDocRef, ParsedDoc
+from .base import Connector, RemoteDocRef, ParsedDoc, dumps_json
+
+logger = logging.getLogger(__name__)
+
+OPINION_LINK_SELECTOR = 'a[href*="opinions" i][href*=".pdf" i]'
+
+# Placeholder outline until opinion PDFs are parsed (serialized as a JSON list)
+OPINION_OUTLINE_SECTIONS = ("Opinion", "Syllabus", "Decision")
+
+# Opinion PDFs larger than this are rejected mid-download
+MAX_PDF_SIZE = 50 * 1024 * 1024
 
 
 class ScotusConnector(Connector):
@@ -30,68 +39,68 @@ class ScotusConnector(Connector):
         """
         updates = []
 
+        # One clock read per listing; the term year is fixed for the whole scrape
+        now = datetime.utcnow()
+        now_iso = now.isoformat()
+        term = now.year
+
         # Default to last 90 days if no timestamp provided
         if since_ts:
             try:
                 since_date = datetime.fromisoformat(since_ts.replace('Z', '+00:00'))
             except:
-                since_date = datetime.utcnow() - timedelta(days=90)
+                since_date = now - timedelta(days=90)
         else:
-            since_date = datetime.utcnow() - timedelta(days=90)
+            since_date = now - timedelta(days=90)
 
         # Scrape opinions page
         # Note: The Supreme Court website structure may change
         # This is a simplified example that would need adjustment for production
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-            try:
-                # Get the opinions page (current term)
-                response = await client.get(
-                    f"{self.base_url}/opinions/slipopinion/{datetime.now().year % 100}"
-                )
-                response.raise_for_status()
-
-                soup = BeautifulSoup(response.text, 'html.parser')
-
-                # Find opinion links (this is simplified - actual scraping logic would depend on site structure)
-                # The Supreme Court website typically lists opinions in tables or lists
-                # For MVP, we'll simulate finding a few opinions
-
-                # Look for PDF links (typical pattern)
-                for link in soup.find_all('a', href=True):
-                    href = link.get('href', '')
-
-                    # Check if it's an opinion PDF
-                    if 'opinions' in href.lower() and '.pdf' in href.lower():
-                        # Extract case information from link text
-                        link_text = link.get_text(strip=True)
-
-                        if not link_text or len(link_text) < 3:
-                            continue
-
-                        # Construct full URL
-                        if not href.startswith('http'):
-                            href = self.base_url + (href if href.startswith('/') else '/' + href)
-
-                        # Extract case number from filename if possible
-                        # Example: 22-1234.pdf -> case number 22-1234
-                        case_number = href.split('/')[-1].replace('.pdf', '')
-
-                        updates.append(RemoteDocRef(
-                            source_id=self.source_id,
-                            remote_id=case_number,
-                            doc_type="opinion",
-                            title=link_text[:200],  # Truncate long titles
-                            url=href,
-                            published_ts=datetime.utcnow().isoformat(),  # Would need actual date from page
-                            metadata={
-                                "case_number": case_number,
-                                "pdf_url": href,
-                                "term": datetime.now().year
-                            }
-                        ))
-
-            except Exception as e:
-                print(f"Error listing SCOTUS opinions: {e}")
+        try:
+            # Get the opinions page (current term)
+            response = await self.http_get(
+                f"{self.base_url}/opinions/slipopinion/{term % 100}",
+                follow_redirects=True
+            )
+            response.raise_for_status()
+
+            tree = LexborHTMLParser(response.text)
+
+            # Opinion PDF links (typical pattern); the selector does the
+            # case-insensitive 'opinions' / '.pdf' href filtering in C
+            for node in tree.css(OPINION_LINK_SELECTOR):
+                href = node.attributes.get('href') or ''
+
+                # Extract case information from link text
+                link_text = node.text(strip=True)
+
+                if len(link_text) < 3:
+                    continue
+
+                # Construct full URL
+                if not href.startswith('http'):
+                    href = self.base_url + (href if href.startswith('/') else '/' + href)
+
+                # Extract case number from filename if possible
+                # Example: 22-1234.pdf -> case number 22-1234
+                case_number = href.rpartition('/')[2].replace('.pdf', '')
+
+                updates.append(RemoteDocRef(
+                    source_id=self.source_id,
+                    remote_id=case_number,
+                    doc_type="opinion",
+                    title=link_text[:200],  # Truncate long titles
+                    url=href,
+                    published_ts=now_iso,  # Would need actual date from page
+                    metadata={
+                        "case_number": case_number,
+                        "pdf_url": href,
+                        "term": term
+                    }
+                ))
+
+        except Exception:
+            logger.exception("Error listing SCOTUS opinions")
 
         # Limit to reasonable number for MVP
         return updates[:20]
@@ -105,15 +114,18 @@ class ScotusConnector(Connector):
         """
         pdf_url = remote_ref.metadata.get("pdf_url", remote_ref.url)
 
-        async with httpx.AsyncClient(timeout=60.0, follow_redirects=True) as client:
-            try:
-                response = await client.get(pdf_url)
-                response.raise_for_status()
-                return response.content
+        try:
+            # PDFs are large; allow longer than the shared client's default
+            return await self.http_download(
+                pdf_url,
+                MAX_PDF_SIZE,
+                timeout=60.0,
+                follow_redirects=True
+            )
 
-            except Exception as e:
-                print(f"Error fetching PDF {remote_ref.remote_id}: {e}")
-                raise
+        except Exception as e:
+            logger.error("Error fetching PDF %s: %s", remote_ref.remote_id, e)
+            raise
 
     async def parse_payload(
         self,
@@ -127,14 +139,15 @@ class ScotusConnector(Connector):
         try:
             # For MVP: Store PDF reference and basic metadata
             # Full PDF parsing with pdfplumber can be added later
+            case_number = remote_ref.metadata.get("case_number")
 
             doc_data = {
                 "source_id": self.source_id,
                 "jurisdiction": "US-FED",
                 "doc_type": "opinion",
                 "title": remote_ref.title,
-                "identifiers_json": json.dumps({
-                    "case_number": remote_ref.metadata.get("case_number")
+                "identifiers_json": dumps_json({
+                    "case_number": case_number
                 }),
                 "canonical_url": remote_ref.url
             }
@@ -142,24 +155,20 @@ class ScotusConnector(Connector):
             # Create outline placeholder
             outline = {
                 "type": "opinion",
-                "case_number": remote_ref.metadata.get("case_number"),
-                "sections": [
-                    "Opinion",
-                    "Syllabus",
-                    "Decision"
-                ]
+                "case_number": case_number,
+                "sections": OPINION_OUTLINE_SECTIONS
             }
 
             # For now, use metadata as snippet
             # In production, would extract text from PDF
-            snippet_text = f"Supreme Court opinion in case {remote_ref.metadata.get('case_number')}. {remote_ref.title}"
+            snippet_text = f"Supreme Court opinion in case {case_number}. {remote_ref.title}"
 
             version_data = {
                 "version_label": "slip_opinion",
                 "published_ts": remote_ref.published_ts,
                 "normalized_text": snippet_text,  # Would be full extracted text in production
-                "outline_json": json.dumps(outline),
-                "snippets_json": json.dumps({
+                "outline_json": dumps_json(outline),
+                "snippets_json": dumps_json({
                     "title": remote_ref.title[:500]
                 }),
                 "content_mode": "thin",  # Using thin mode since we're not parsing full PDF yet
@@ -172,5 +181,5 @@ class ScotusConnector(Connector):
             )
 
         except Exception as e:
-            print(f"Error parsing opinion: {e}")
+            logger.error("Error parsing opinion: %s", e)
             raise
@@ -2,14 +2,46 @@
 User Uploads connector
 Watches a directory for user-uploaded documents (PDF, DOCX, TXT, HTML)
 """
-import json
+import asyncio
 import hashlib
+import logging
+import os
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
 from datetime import datetime
 
-from .base import Connector, RemoteDocRef, ParsedDoc
+from .base import Connector, RemoteDocRef, ParsedDoc, dumps_json
 from ..parsers.document_parser import DocumentParser
+from ..parsers.parse_pool import PoolResult, parse_in_pool
+
+logger = logging.getLogger(__name__)
+
+# Recent parse results keyed by (content digest, format), kept across syncs so
+# a file whose mtime changed but whose bytes did not is not parsed again.
+# Bounded by the characters held (text plus JSON columns), oldest evicted first.
+PARSE_CACHE_MAX_CHARS = 32 * 1024 * 1024
+_parse_cache: "OrderedDict[Tuple[bytes, str], Tuple[PoolResult, int]]" = OrderedDict()
+_parse_cache_chars = 0
+
+# Files larger than this are never read into the server process: they are
+# hashed in chunks and the parse worker maps the file itself, so a file
+# truncated mid-sync can only take down a worker, not the server
+LARGE_FILE_THRESHOLD = 4 * 1024 * 1024
+
+
+def _content_digest(raw: Union[bytes, Path]) -> bytes:
+    """Parse cache key for file contents (a Path is read in chunks)"""
+    if isinstance(raw, Path):
+        with open(raw, 'rb') as f:
+            return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=32)).digest()
+    return hashlib.blake2b(raw, digest_size=32).digest()
+
+
+def _file_signature(path: Path) -> Tuple[int, int]:
+    """Size and mtime, to notice a file rewritten while it was being parsed"""
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
 
 
 class UserUploadsConnector(Connector):
@@ -56,60 +88,129 @@ class UserUploadsConnector(Connector):
             except Exception:
                 since_datetime = None
 
-        # Walk through uploads directory
-        for file_path in self.uploads_dir.rglob('*'):
-            # Skip directories
-            if not file_path.is_file():
-                continue
-
-            # Check file extension
-            ext = file_path.suffix.lower().lstrip('.')
-            if ext not in self.parser.SUPPORTED_FORMATS:
-                continue
-
-            # Check modification time
-            mod_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-            if since_datetime and mod_time <= since_datetime:
-                continue
-
-            # Check file size
-            file_size = file_path.stat().st_size
-            if file_size > self.parser.MAX_FILE_SIZE:
-                print(f"[WARN] File too large, skipping: {file_path.name} ({file_size} bytes)")
-                continue
-
-            if file_size == 0:
-                print(f"[WARN] Empty file, skipping: {file_path.name}")
-                continue
-
-            # Create remote reference
-            # Use file path hash as remote_id for uniqueness
-            relative_path = file_path.relative_to(self.uploads_dir)
-            remote_id = hashlib.md5(str(relative_path).encode()).hexdigest()
-
-            updates.append(RemoteDocRef(
-                source_id=self.source_id,
-                remote_id=remote_id,
-                doc_type=ext,  # pdf, docx, txt, html
-                title=file_path.stem,  # Filename without extension
-                url=str(file_path.absolute()),  # Local file path
-                published_ts=mod_time.isoformat(),
-                metadata={
-                    "filename": file_path.name,
-                    "relative_path": str(relative_path),
-                    "absolute_path": str(file_path.absolute()),
-                    "file_size": file_size,
-                    "modified_ts": mod_time.isoformat(),
-                    "extension": ext
-                }
-            ))
+        supported_formats = frozenset(self.parser.SUPPORTED_FORMATS)
+        max_file_size = self.parser.MAX_FILE_SIZE
+        # Walk from the absolute root so entry paths need no further resolving
+        uploads_root = str(self.uploads_dir.absolute())
+        root_prefix_len = len(os.path.join(uploads_root, ''))
+
+        # Walk through uploads directory; scandir entries carry the file type
+        # and one stat() covers both mtime and size
+        pending_dirs = [uploads_root]
+        while pending_dirs:
+            with os.scandir(pending_dirs.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending_dirs.append(entry.path)
+                        continue
+
+                    # Skip hidden files (.DS_Store, ._ resource forks, editor temp files)
+                    if entry.name.startswith('.'):
+                        continue
+
+                    # Check file extension (name only, no syscall)
+                    stem, suffix = os.path.splitext(entry.name)
+                    ext = suffix[1:].lower()
+                    if ext not in supported_formats:
+                        continue
+
+                    # Skip anything that isn't a regular file
+                    if not entry.is_file():
+                        continue
+
+                    stat = entry.stat()
+
+                    # Check modification time
+                    mod_time = datetime.fromtimestamp(stat.st_mtime)
+                    if since_datetime and mod_time <= since_datetime:
+                        continue
+
+                    # Check file size
+                    file_size = stat.st_size
+                    if file_size > max_file_size:
+                        logger.warning("File too large, skipping: %s (%s bytes)", entry.name, file_size)
+                        continue
+
+                    if file_size == 0:
+                        logger.warning("Empty file, skipping: %s", entry.name)
+                        continue
+
+                    # Create remote reference
+                    # Use file path hash as remote_id for uniqueness
+                    absolute_path = entry.path
+                    relative_path = absolute_path[root_prefix_len:]
+                    remote_id = hashlib.md5(relative_path.encode()).hexdigest()
+
+                    updates.append(RemoteDocRef(
+                        source_id=self.source_id,
+                        remote_id=remote_id,
+                        doc_type=ext,  # pdf, docx, txt, html
+                        title=stem,  # Filename without extension
+                        url=absolute_path,  # Local file path
+                        published_ts=mod_time.isoformat(),
+                        metadata={
+                            "filename": entry.name,
+                            "relative_path": relative_path,
+                            "absolute_path": absolute_path,
+                            "file_size": file_size,
+                            "modified_ts": mod_time.isoformat(),
+                            "extension": ext
+                        }
+                    ))
 
         return updates
 
+    async def _parse_cached(
+        self,
+        raw: Union[bytes, Path],
+        remote_ref: RemoteDocRef
+    ) -> PoolResult:
+        """Parse in the worker pool, reusing the result for identical file bytes"""
+        global _parse_cache_chars
+
+        filename = remote_ref.metadata["filename"]
+        file_ext = remote_ref.metadata["extension"]
+        on_disk = isinstance(raw, Path)
+
+        if on_disk:
+            signature = await asyncio.to_thread(_file_signature, raw)
+
+        # Hashing up to MAX_FILE_SIZE bytes would stall the event loop
+        digest = await asyncio.to_thread(_content_digest, raw)
+        key = (digest, file_ext)
+
+        cached = _parse_cache.get(key)
+        if cached is not None:
+            _parse_cache.move_to_end(key)
+            return cached[0]
+
+        # Large files go to the worker as a path rather than pickled bytes
+        result = await parse_in_pool(str(raw) if on_disk else raw, filename, file_ext)
+
+        # The worker read the file after it was hashed; only cache the
+        # result if the file was not rewritten in between
+        cacheable = not on_disk or await asyncio.to_thread(_file_signature, raw) == signature
+
+        parsed, columns = result
+        size = len(parsed.text) + sum(len(value) for value in columns.values() if value)
+        if cacheable and size <= PARSE_CACHE_MAX_CHARS:
+            # A concurrent parse of identical bytes may have cached it meanwhile
+            replaced = _parse_cache.pop(key, None)
+            if replaced is not None:
+                _parse_cache_chars -= replaced[1]
+
+            _parse_cache[key] = (result, size)
+            _parse_cache_chars += size
+            while _parse_cache_chars > PARSE_CACHE_MAX_CHARS and _parse_cache:
+                _, (_, evicted_size) = _parse_cache.popitem(last=False)
+                _parse_cache_chars -= evicted_size
+
+        return result
+
     async def fetch_doc(
         self,
         remote_ref: RemoteDocRef
-    ) -> bytes:
+    ) -> Union[bytes, Path]:
         """
         Read document file from disk
 
@@ -117,13 +218,16 @@ class UserUploadsConnector(Connector):
             remote_ref: Reference to the local file
 
         Returns:
-            Raw file bytes
+            Raw file bytes, or the file's Path for files over LARGE_FILE_THRESHOLD
         """
         file_path = Path(remote_ref.metadata["absolute_path"])
 
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
 
+        if remote_ref.metadata.get("file_size", 0) > LARGE_FILE_THRESHOLD:
+            return file_path
+
         try:
             with open(file_path, 'rb') as f:
                 return f.read()
@@ -132,14 +236,14 @@ class UserUploadsConnector(Connector):
 
     async def parse_payload(
         self,
-        raw: bytes,
+        raw: Union[bytes, Path],
         remote_ref: RemoteDocRef
     ) -> ParsedDoc:
         """
         Parse uploaded document using DocumentParser
 
         Args:
-            raw: Raw file bytes
+            raw: Raw file bytes, or the file's Path for large files
             remote_ref: Reference to the file
 
         Returns:
@@ -149,8 +253,8 @@ class UserUploadsConnector(Connector):
         file_ext = remote_ref.metadata["extension"]
 
         try:
-            # Parse document using DocumentParser
-            parsed = self.parser.parse(raw, filename, format_hint=file_ext)
+            # Parse document using DocumentParser (JSON columns come back pre-serialized)
+            parsed, columns = await self._parse_cached(raw, remote_ref)
 
             # Create document data
             doc_data = {
@@ -158,7 +262,7 @@ class UserUploadsConnector(Connector):
                 "jurisdiction": None,  # User uploads don't have jurisdiction
                 "doc_type": file_ext,
                 "title": remote_ref.title,
-                "identifiers_json": json.dumps({
+                "identifiers_json": dumps_json({
                     "remote_id": remote_ref.remote_id,
                     "filename": filename,
                     "path": remote_ref.metadata["relative_path"]
@@ -171,29 +275,18 @@ class UserUploadsConnector(Connector):
                 "source_path": remote_ref.metadata["relative_path"]
             }
 
-            # Prepare outline JSON
-            outline_data = []
-            for section in parsed.outline:
-                outline_data.append({
-                    "level": section.level,
-                    "title": section.title,
-                    "start_char": section.start_char,
-                    "end_char": section.end_char,
-                    "page": section.page
-                })
-
             # Create version data
             version_data = {
                 "version_label": "uploaded",
                 "published_ts": remote_ref.published_ts,
                 "normalized_text": parsed.text,
-                "outline_json": json.dumps(outline_data) if outline_data else None,
-                "snippets_json": json.dumps(parsed.snippets) if parsed.snippets else None,
+                "outline_json": columns["outline_json"],
+                "snippets_json": columns["snippets_json"],
                 "content_mode": "full",
                 "raw_path": None,  # Could cache raw file if needed
                 # New fields from migration 004
-                "parse_warnings_json": json.dumps(parsed.warnings) if parsed.warnings else None,
-                "page_map_json": json.dumps(parsed.page_map) if parsed.page_map else None,
+                "parse_warnings_json": columns["parse_warnings_json"],
+                "page_map_json": columns["page_map_json"],
                 "confidence_score": parsed.confidence_score
             }
 
@@ -204,14 +297,14 @@ class UserUploadsConnector(Connector):
 
         except Exception as e:
             # If parsing fails, create a minimal document entry with error info
-            print(f"[ERROR] Failed to parse {filename}: {e}")
+            logger.exception("Failed to parse %s", filename)
 
             doc_data = {
                 "source_id": self.source_id,
                 "jurisdiction": None,
                 "doc_type": file_ext,
                 "title": f"{remote_ref.title} (parse failed)",
-                "identifiers_json": json.dumps({
+                "identifiers_json": dumps_json({
                     "remote_id": remote_ref.remote_id,
                     "filename": filename
                 }),
@@ -230,7 +323,7 @@ class UserUploadsConnector(Connector):
                 "snippets_json": None,
                 "content_mode": "thin",
                 "raw_path": None,
-                "parse_warnings_json": json.dumps([f"Parse failed: {str(e)}"]),
+                "parse_warnings_json": dumps_json([f"Parse failed: {str(e)}"]),
                 "page_map_json": None,
                 "confidence_score": 0.0
             }
@@ -2,12 +2,14 @@
 Database management for LLUT
 SQLite with FTS5 full-text search
 """
+import asyncio
 import sqlite3
 import aiosqlite
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 
 from .config import settings
 
@@ -15,66 +17,237 @@ from .config import settings
 class Database:
     """SQLite database manager"""
 
+    # Read-only connections serving fetch_one/fetch_all; all writes go through
+    # the single writer connection
+    READ_POOL_SIZE = 4
+
+    # Rows per executemany/transaction in bulk_insert
+    BULK_INSERT_BATCH = 10000
+
+    # WAL file size above which checkpoint_wal truncates it
+    WAL_CHECKPOINT_BYTES = 64 * 1024 * 1024
+
+    # Prepared statements kept per connection by sqlite3 (default 128)
+    CACHED_STATEMENTS = 256
+
+    # INSERT templates for the hot tables. sqlite3 caches prepared statements
+    # by SQL text, so every writer sharing one constant reuses one statement.
+    DOCUMENT_INSERT_SQL = """
+        INSERT INTO document (
+            id, source_id, jurisdiction, doc_type,
+            title, identifiers_json, canonical_url,
+            first_seen_ts, last_seen_ts,
+            is_user_uploaded, original_filename, upload_mime, source_path
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    VERSION_INSERT_SQL = """
+        INSERT INTO version (
+            id, document_id, version_label, published_ts,
+            fetched_ts, content_mode, content_hash,
+            normalized_text, outline_json, snippets_json,
+            parse_warnings_json, page_map_json, confidence_score
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    CHANGE_EVENT_INSERT_SQL = """
+        INSERT INTO change_event (
+            id, document_id, new_version_id,
+            change_type, summary, created_ts
+        ) VALUES (?, ?, ?, ?, ?, ?)
+    """
+
+    CITATION_SPAN_INSERT_SQL = """
+        INSERT OR REPLACE INTO citation_span (
+            id, document_id, version_id, quote_text,
+            start_char, end_char, verified, match_method, confidence,
+            heading, page_number
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
     def __init__(self, db_path: Optional[Path] = None):
         self.db_path = db_path or settings.db_path
         self._conn: Optional[aiosqlite.Connection] = None
+        self._readers: Optional[asyncio.Queue] = None
+        self._reader_conns: List[aiosqlite.Connection] = []
+        self._readers_lock = asyncio.Lock()
+        self._transaction_lock = asyncio.Lock()
+        # Set while the current task holds _transaction_lock, so its own
+        # statements run inside the open transaction instead of waiting on it
+        self._in_transaction: ContextVar[bool] = ContextVar("in_transaction", default=False)
+
+    async def _open_connection(self) -> aiosqlite.Connection:
+        """Open a connection with the per-connection settings"""
+        conn = await aiosqlite.connect(
+            str(self.db_path),
+            isolation_level=None,  # Autocommit mode
+            cached_statements=self.CACHED_STATEMENTS
+        )
+        conn.row_factory = aiosqlite.Row
+        # Per-connection settings: foreign keys; one fsync per checkpoint
+        # instead of per commit (safe under WAL); temp tables in memory;
+        # 64 MB page cache; 256 MB memory-mapped reads; wait up to 5 s on a
+        # locked database instead of failing with SQLITE_BUSY
+        await conn.executescript("""
+            PRAGMA foreign_keys = ON;
+            PRAGMA synchronous = NORMAL;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA cache_size = -65536;
+            PRAGMA mmap_size = 268435456;
+            PRAGMA busy_timeout = 5000;
+        """)
+        return conn
 
     async def connect(self) -> aiosqlite.Connection:
-        """Get or create database connection"""
+        """Get or create the writer connection"""
         if self._conn is None:
-            self._conn = await aiosqlite.connect(
-                str(self.db_path),
-                isolation_level=None  # Autocommit mode
-            )
-            # Enable foreign keys
-            await self._conn.execute("PRAGMA foreign_keys = ON")
-            # Enable WAL mode for better concurrency
+            self._conn = await self._open_connection()
+            # Enable WAL mode so readers don't block on the writer
             await self._conn.execute("PRAGMA journal_mode = WAL")
 
         return self._conn
 
+    @asynccontextmanager
+    async def _reader(self):
+        """Borrow a read-only connection from the pool"""
+        if self._readers is None:
+            async with self._readers_lock:
+                if self._readers is None:
+                    # The writer creates the file and switches it to WAL first
+                    await self.connect()
+                    readers = asyncio.Queue()
+                    for _ in range(self.READ_POOL_SIZE):
+                        conn = await self._open_connection()
+                        await conn.execute("PRAGMA query_only = ON")
+                        self._reader_conns.append(conn)
+                        readers.put_nowait(conn)
+                    self._readers = readers
+
+        conn = await self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
+
     async def close(self):
-        """Close database connection"""
+        """Close database connections"""
+        for conn in self._reader_conns:
+            await conn.close()
+        self._reader_conns = []
+        self._readers = None
+
         if self._conn:
             await self._conn.close()
             self._conn = None
 
     @asynccontextmanager
     async def transaction(self):
-        """Context manager for database transactions"""
+        """
+        Context manager for database transactions (one open at a time)
+
+        Statements from other tasks wait until the transaction ends, so they
+        are never committed or rolled back with it. A transaction opened
+        inside another one joins the outer transaction.
+        """
         conn = await self.connect()
-        try:
-            await conn.execute("BEGIN")
+
+        if self._in_transaction.get():
+            yield conn
+            return
+
+        async with self._transaction_lock:
+            token = self._in_transaction.set(True)
+            try:
+                await conn.execute("BEGIN")
+                yield conn
+                await conn.commit()
+            except BaseException:
+                await conn.rollback()
+                raise
+            finally:
+                self._in_transaction.reset(token)
+
+    @asynccontextmanager
+    async def _writer(self):
+        """The writer connection, once no other task's transaction is open"""
+        conn = await self.connect()
+
+        if self._in_transaction.get():
             yield conn
-            await conn.commit()
-        except Exception:
-            await conn.rollback()
-            raise
+        else:
+            async with self._transaction_lock:
+                yield conn
 
     async def execute(self, query: str, params: tuple = ()) -> aiosqlite.Cursor:
         """Execute a query"""
-        conn = await self.connect()
-        return await conn.execute(query, params)
+        async with self._writer() as conn:
+            return await conn.execute(query, params)
 
     async def execute_many(self, query: str, params_list: List[tuple]) -> aiosqlite.Cursor:
         """Execute a query with multiple parameter sets"""
-        conn = await self.connect()
-        return await conn.executemany(query, params_list)
+        async with self._writer() as conn:
+            return await conn.executemany(query, params_list)
+
+    async def bulk_insert(
+        self,
+        query: str,
+        rows: List[tuple],
+        batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Run an INSERT for many parameter sets
+
+        Rows are written with executemany in batches of batch_size (default
+        BULK_INSERT_BATCH), one transaction per batch, instead of one
+        autocommit transaction per row.
+
+        Returns:
+            Number of rows written
+        """
+        batch_size = batch_size or self.BULK_INSERT_BATCH
+
+        for start in range(0, len(rows), batch_size):
+            async with self.transaction() as conn:
+                await conn.executemany(query, rows[start:start + batch_size])
+
+        return len(rows)
+
+    async def checkpoint_wal(self, min_bytes: int = 0) -> bool:
+        """
+        Checkpoint and truncate the WAL file once it reaches min_bytes
+
+        Automatic checkpoints never shrink the file, and with readers active
+        during a long sync they can't reset it either. Runs between
+        transactions on the writer connection.
+
+        Returns:
+            True if a checkpoint was run
+        """
+        wal_file = Path(str(self.db_path) + "-wal")
+        try:
+            wal_size = wal_file.stat().st_size
+        except FileNotFoundError:
+            return False
+
+        if wal_size < min_bytes:
+            return False
+
+        async with self._writer() as conn:
+            await conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return True
 
     async def fetch_one(self, query: str, params: tuple = ()) -> Optional[Dict[str, Any]]:
-        """Fetch one row as dict"""
-        conn = await self.connect()
-        conn.row_factory = aiosqlite.Row
-        cursor = await conn.execute(query, params)
-        row = await cursor.fetchone()
+        """Fetch one row as dict (on a pooled read-only connection)"""
+        async with self._reader() as conn:
+            cursor = await conn.execute(query, params)
+            row = await cursor.fetchone()
         return dict(row) if row else None
 
     async def fetch_all(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
-        """Fetch all rows as list of dicts"""
-        conn = await self.connect()
-        conn.row_factory = aiosqlite.Row
-        cursor = await conn.execute(query, params)
-        rows = await cursor.fetchall()
+        """Fetch all rows as list of dicts (on a pooled read-only connection)"""
+        async with self._reader() as conn:
+            cursor = await conn.execute(query, params)
+            rows = await cursor.fetchall()
         return [dict(row) for row in rows]
 
     async def initialize(self):
@@ -103,17 +276,25 @@ class Database:
         row = await cursor.fetchone()
         current_version = row[0] if row[0] is not None else 0
 
-        # Apply migrations
+        # Apply migrations; each one and its _migrations row commit together
+        # (executescript commits any open transaction, so BEGIN goes in the script)
         migrations = self._get_migrations()
         for version, name, sql in migrations:
             if version > current_version:
                 print(f"Applying migration {version}: {name}")
-                await conn.executescript(sql)
-                await conn.execute(
-                    "INSERT INTO _migrations (version, name, applied_at) VALUES (?, ?, ?)",
-                    (version, name, datetime.utcnow().isoformat())
-                )
-                await conn.commit()
+                applied_at = datetime.utcnow().isoformat()
+                try:
+                    await conn.executescript(f"""
+                        BEGIN;
+                        {sql}
+                        INSERT INTO _migrations (version, name, applied_at)
+                        VALUES ({int(version)}, '{name}', '{applied_at}');
+                        COMMIT;
+                    """)
+                except Exception:
+                    if conn.in_transaction:
+                        await conn.rollback()
+                    raise
 
     def _get_migrations(self) -> List[tuple]:
         """Get list of migrations (version, name, sql)"""
@@ -123,6 +304,8 @@ class Database:
             (3, "fix_fts_index", self._migration_003_fix_fts_index()),
             (4, "user_uploads", self._migration_004_user_uploads()),
             (5, "citation_verification", self._migration_005_citation_verification()),
+            (6, "document_remote_id", self._migration_006_document_remote_id()),
+            (7, "backfill_document_remote_id", self._migration_007_backfill_document_remote_id()),
         ]
 
     def _migration_001_initial_schema(self) -> str:
@@ -342,6 +525,47 @@ class Database:
         CREATE INDEX IF NOT EXISTS idx_citation_span_version ON citation_span(version_id);
         """
 
+    def _migration_006_document_remote_id(self) -> str:
+        """Migration 006: Map connector remote ids to documents"""
+        return """
+        -- Lookup table replacing LIKE scans over identifiers_json during sync
+        CREATE TABLE IF NOT EXISTS document_remote_id (
+            source_id TEXT NOT NULL,
+            remote_id TEXT NOT NULL,
+            document_id TEXT NOT NULL,
+            PRIMARY KEY (source_id, remote_id),
+            FOREIGN KEY (document_id) REFERENCES document(id)
+        );
+        """
+
+    def _migration_007_backfill_document_remote_id(self) -> str:
+        """Migration 007: Map documents synced before document_remote_id existed"""
+        return """
+        -- Rebuild each connector's remote id from its identifiers_json
+        -- (see the connectors' list_updates/parse_payload); oldest document wins
+        INSERT OR IGNORE INTO document_remote_id (source_id, remote_id, document_id)
+        SELECT source_id, remote_id, id FROM (
+            SELECT
+                id,
+                source_id,
+                first_seen_ts,
+                CASE source_id
+                    WHEN 'congress_gov' THEN
+                        json_extract(identifiers_json, '$.congress') || '-' ||
+                        json_extract(identifiers_json, '$.bill_type') || '-' ||
+                        json_extract(identifiers_json, '$.bill_number')
+                    WHEN 'govinfo' THEN json_extract(identifiers_json, '$.package_id')
+                    WHEN 'federal_register' THEN json_extract(identifiers_json, '$.document_number')
+                    WHEN 'scotus' THEN json_extract(identifiers_json, '$.case_number')
+                    WHEN 'user_uploads' THEN json_extract(identifiers_json, '$.remote_id')
+                END AS remote_id
+            FROM document
+            WHERE json_valid(identifiers_json)
+        )
+        WHERE remote_id IS NOT NULL AND remote_id != ''
+        ORDER BY first_seen_ts;
+        """
+
     # User Uploads Helper Methods
 
     async def pin_document(self, doc_id: str) -> bool:
@@ -476,13 +700,7 @@ class Database:
         """
         try:
             await self.execute(
-                """
-                INSERT OR REPLACE INTO citation_span (
-                    id, document_id, version_id, quote_text,
-                    start_char, end_char, verified, match_method, confidence,
-                    heading, page_number
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                self.CITATION_SPAN_INSERT_SQL,
                 (
                     citation_id, document_id, version_id, quote_text,
                     start_char, end_char, 1 if verified else 0, match_method, confidence,
@@ -527,14 +745,8 @@ class Database:
                     citation.get("page_number")
                 ))
 
-            await self.execute_many(
-                """
-                INSERT OR REPLACE INTO citation_span (
-                    id, document_id, version_id, quote_text,
-                    start_char, end_char, verified, match_method, confidence,
-                    heading, page_number
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+            await self.bulk_insert(
+                self.CITATION_SPAN_INSERT_SQL,
                 params_list
             )
             return len(citations)
@@ -593,8 +805,7 @@ class Database:
 
     async def reset(self):
         """Reset database - delete all data and recreate schema"""
-        if self._conn:
-            await self.close()
+        await self.close()
 
         # Delete database file
         if self.db_path.exists():
@@ -2,35 +2,85 @@
 Diff engine for comparing document versions
 """
 import difflib
-import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
+
+import orjson
+
+try:
+    from cdifflib import CSequenceMatcher as _SequenceMatcher
+except ImportError:  # Optional C matcher; same opcodes as difflib's pure-Python one
+    _SequenceMatcher = difflib.SequenceMatcher
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Unified diff hunk range ('start,length'), as difflib formats it"""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _unified_diff(a: List[str], b: List[str], n: int) -> Iterator[str]:
+    """
+    difflib.unified_diff(a, b, lineterm='', n=n) on _SequenceMatcher
+
+    difflib hardwires its own SequenceMatcher, so the hunk rendering is
+    repeated here to let the C matcher do the line matching.
+    """
+    # Match on interned line ids: each distinct line is hashed once, and the
+    # matcher compares ints instead of re-hashing and comparing strings
+    line_ids: Dict[str, int] = {}
+    a_ids = [line_ids.setdefault(line, len(line_ids)) for line in a]
+    b_ids = [line_ids.setdefault(line, len(line_ids)) for line in b]
+
+    started = False
+    for group in _SequenceMatcher(None, a_ids, b_ids).get_grouped_opcodes(n):
+        if not started:
+            started = True
+            yield '--- '
+            yield '+++ '
+
+        first, last = group[0], group[-1]
+        yield f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@"
+
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                for line in a[i1:i2]:
+                    yield ' ' + line
+                continue
+            if tag in ('replace', 'delete'):
+                for line in a[i1:i2]:
+                    yield '-' + line
+            if tag in ('replace', 'insert'):
+                for line in b[j1:j2]:
+                    yield '+' + line
 
 
 def compute_text_diff(
     old_text: str,
     new_text: str,
-    context_lines: int = 3
+    context_lines: int = 3,
+    include_raw: bool = False
 ) -> Dict[str, Any]:
     """
     Compute diff between two text versions
-    Returns unified diff format
+    Returns unified diff format (the raw diff lines only with include_raw)
     """
     old_lines = old_text.splitlines(keepends=True)
     new_lines = new_text.splitlines(keepends=True)
 
-    # Generate unified diff
-    diff = list(difflib.unified_diff(
-        old_lines,
-        new_lines,
-        lineterm='',
-        n=context_lines
-    ))
-
-    # Parse diff into structured format
+    # Parse the unified diff into structured format as it is generated
     changes = []
     current_chunk = None
+    raw_diff = [] if include_raw else None
+
+    for line in _unified_diff(old_lines, new_lines, context_lines):
+        if raw_diff is not None:
+            raw_diff.append(line)
 
-    for line in diff:
         if line.startswith('---') or line.startswith('+++'):
             continue
         elif line.startswith('@@'):
@@ -58,16 +108,19 @@ def compute_text_diff(
     total_additions = sum(len(c["additions"]) for c in changes)
     total_deletions = sum(len(c["deletions"]) for c in changes)
 
-    return {
+    result = {
         "changes": changes,
         "statistics": {
             "chunks": len(changes),
             "additions": total_additions,
             "deletions": total_deletions,
             "total_changes": total_additions + total_deletions
-        },
-        "raw_diff": diff
+        }
     }
+    if raw_diff is not None:
+        result["raw_diff"] = raw_diff
+
+    return result
 
 
 def compute_section_diff(
@@ -79,18 +132,14 @@ def compute_section_diff(
     Useful for structured legal documents
     """
     try:
-        old_struct = json.loads(old_outline) if isinstance(old_outline, str) else old_outline
-        new_struct = json.loads(new_outline) if isinstance(new_outline, str) else new_outline
+        old_struct = orjson.loads(old_outline) if isinstance(old_outline, str) else old_outline
+        new_struct = orjson.loads(new_outline) if isinstance(new_outline, str) else new_outline
     except:
         return {"error": "Invalid outline JSON"}
 
-    # Extract sections from both
-    old_sections = _extract_sections(old_struct)
-    new_sections = _extract_sections(new_struct)
-
     # Find added, removed, and common sections
-    old_set = set(old_sections)
-    new_set = set(new_sections)
+    old_set = frozenset(_extract_sections(old_struct))
+    new_set = frozenset(_extract_sections(new_struct))
 
     added = list(new_set - old_set)
     removed = list(old_set - new_set)
@@ -108,22 +157,31 @@ def compute_section_diff(
     }
 
 
-def _extract_sections(outline: Dict[str, Any]) -> List[str]:
-    """Extract section names from outline structure"""
-    sections = []
+def _extract_sections(outline: Dict[str, Any]) -> Iterator[str]:
+    """Yield the (non-empty) section names from an outline structure"""
+    if not isinstance(outline, dict):
+        return
+
+    # Handle different outline structures
+    for section in outline.get("sections", ()):
+        if isinstance(section, dict):
+            section = section.get("title", section.get("heading", ""))
+        elif not isinstance(section, str):
+            continue
+        if section:
+            yield section
 
-    if isinstance(outline, dict):
-        # Handle different outline structures
-        if "sections" in outline:
-            for section in outline.get("sections", []):
-                if isinstance(section, dict):
-                    sections.append(section.get("title", section.get("heading", "")))
-                elif isinstance(section, str):
-                    sections.append(section)
-        if "heading" in outline:
-            sections.append(outline["heading"])
+    heading = outline.get("heading")
+    if heading:
+        yield heading
 
-    return [s for s in sections if s]
+
+def _hash_scheme(content_hash: Optional[str]) -> str:
+    """Hash scheme of a stored content hash ("sha256" for legacy bare digests)"""
+    if not content_hash:
+        return ""
+    scheme, sep, _ = content_hash.partition(":")
+    return scheme if sep else "sha256"
 
 
 def compute_smart_diff(
@@ -164,10 +222,14 @@ def compute_smart_diff(
 
     result["section_diff"] = compute_section_diff(old_outline, new_outline)
 
-    # Content hash comparison
-    result["content_changed"] = (
-        old_version.get("content_hash") != new_version.get("content_hash")
-    )
+    # Content hash comparison; versions hashed with different schemes
+    # (legacy SHA-256 vs BLAKE2b) fall back to comparing the text itself
+    old_hash = old_version.get("content_hash")
+    new_hash = new_version.get("content_hash")
+    if _hash_scheme(old_hash) == _hash_scheme(new_hash):
+        result["content_changed"] = old_hash != new_hash
+    else:
+        result["content_changed"] = old_text != new_text
 
     # Summary
     text_stats = result["text_diff"].get("statistics", {})
@@ -3,6 +3,8 @@ Job management system for sync operations
 """
 import asyncio
 import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 from enum import Enum
@@ -17,6 +19,15 @@ class JobStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+@dataclass(slots=True)
+class ProgressState:
+    """Progress of one source within a job (mutated in place on each update)"""
+    stage: str = "starting"
+    items_done: int = 0
+    items_total: int = 0
+    last_error: Optional[str] = None
+
+
 class Job:
     """Represents a sync job"""
 
@@ -27,7 +38,7 @@ class Job:
         self.created_at = datetime.utcnow().isoformat()
         self.started_at: Optional[str] = None
         self.completed_at: Optional[str] = None
-        self.progress: Dict[str, Dict[str, Any]] = {}
+        self.progress: Dict[str, ProgressState] = {}
         self.error: Optional[str] = None
         self.task: Optional[asyncio.Task] = None
 
@@ -40,7 +51,10 @@ class Job:
             "created_at": self.created_at,
             "started_at": self.started_at,
             "completed_at": self.completed_at,
-            "progress": self.progress,
+            "progress": {
+                source_id: asdict(state)
+                for source_id, state in self.progress.items()
+            },
             "error": self.error
         }
 
@@ -48,15 +62,22 @@ class Job:
 class JobManager:
     """Manages sync jobs"""
 
+    # Finished jobs beyond this many are dropped, oldest first
+    MAX_JOBS = 100
+
     def __init__(self):
-        self.jobs: Dict[str, Job] = {}
+        # Insertion-ordered, so the oldest job is always first
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
         self.current_job: Optional[Job] = None
+        self._latest_job_id: Optional[str] = None
 
     async def create_sync_job(self, sources: Optional[List[str]] = None) -> str:
         """Create a new sync job"""
         job_id = str(uuid.uuid4())
         job = Job(job_id, sources)
         self.jobs[job_id] = job
+        self._latest_job_id = job_id
+        self._evict_old_jobs()
 
         # Start the job
         job.task = asyncio.create_task(self._run_sync_job(job))
@@ -87,12 +108,7 @@ class JobManager:
 
                 try:
                     # Initialize progress for this source
-                    job.progress[connector.source_id] = {
-                        "stage": "starting",
-                        "items_done": 0,
-                        "items_total": 0,
-                        "last_error": None
-                    }
+                    progress = job.progress[connector.source_id] = ProgressState()
 
                     # Run connector sync
                     await connector.sync(
@@ -101,12 +117,12 @@ class JobManager:
                     )
 
                     # Mark as complete
-                    job.progress[connector.source_id]["stage"] = "completed"
+                    progress.stage = "completed"
 
                 except Exception as e:
                     # Record error but continue with other sources
-                    job.progress[connector.source_id]["last_error"] = str(e)
-                    job.progress[connector.source_id]["stage"] = "failed"
+                    progress.last_error = str(e)
+                    progress.stage = "failed"
 
             # Job completed
             if job.status != JobStatus.CANCELLED:
@@ -131,13 +147,24 @@ class JobManager:
         items_done: int,
         items_total: int
     ):
-        """Update job progress"""
-        if source_id in job.progress:
-            job.progress[source_id].update({
-                "stage": stage,
-                "items_done": items_done,
-                "items_total": items_total
-            })
+        """Update job progress (in place, no per-update allocation)"""
+        progress = job.progress.get(source_id)
+        if progress is not None:
+            progress.stage = stage
+            progress.items_done = items_done
+            progress.items_total = items_total
+
+    def _evict_old_jobs(self):
+        """Drop the oldest finished jobs once more than MAX_JOBS are kept"""
+        excess = len(self.jobs) - self.MAX_JOBS
+        if excess <= 0:
+            return
+
+        for job_id in [
+            job_id for job_id, job in self.jobs.items()
+            if job.status not in (JobStatus.PENDING, JobStatus.RUNNING)
+        ][:excess]:
+            del self.jobs[job_id]
 
     async def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get status of a specific job"""
@@ -146,12 +173,10 @@ class JobManager:
 
     async def get_latest_job_status(self) -> Optional[Dict[str, Any]]:
         """Get status of the most recent job"""
-        if not self.jobs:
+        if self._latest_job_id is None:
             return None
 
-        # Get most recent job
-        latest_job = max(self.jobs.values(), key=lambda j: j.created_at)
-        return latest_job.to_dict()
+        return self.jobs[self._latest_job_id].to_dict()
 
     async def cancel_job(self, job_id: str) -> bool:
         """Cancel a running job"""
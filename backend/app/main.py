@@ -3,8 +3,12 @@ LLUT FastAPI Main Application
 """
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+import asyncio
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from typing import Dict, Any
 import sys
 from pathlib import Path
@@ -12,13 +16,57 @@ from pathlib import Path
 from .config import settings
 from .db import db
 from .settings import settings_manager
+from .connectors import get_enabled_connectors
+from .connectors.http_client import close_http_client, warmup_http_client
+from .parsers.parse_pool import shutdown_parse_pool
 from .routers import api_router
 
+logger = logging.getLogger(__name__)
+
+# Seconds between WAL size checks
+WAL_CHECKPOINT_INTERVAL = 30
+
+
+def start_log_listener() -> QueueListener:
+    """
+    Route app.* log records through a queue
+
+    Handlers run on the listener's thread, so logging from connectors never
+    blocks the event loop on stderr writes.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(logging.DEBUG if settings.debug else logging.INFO)
+    for handler in list(app_logger.handlers):
+        if isinstance(handler, QueueHandler):
+            app_logger.removeHandler(handler)  # From a previous lifespan (tests, reloads)
+    app_logger.addHandler(QueueHandler(log_queue))
+    app_logger.propagate = False
+
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
+
+async def wal_checkpoint_loop():
+    """Periodically truncate the WAL once it outgrows Database.WAL_CHECKPOINT_BYTES"""
+    while True:
+        await asyncio.sleep(WAL_CHECKPOINT_INTERVAL)
+        try:
+            if await db.checkpoint_wal(db.WAL_CHECKPOINT_BYTES):
+                logger.info("Checkpointed and truncated the WAL")
+        except Exception:
+            logger.exception("WAL checkpoint failed")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
+    log_listener = start_log_listener()
     print(f"Starting {settings.app_name} v{settings.app_version}")
     print(f"Database: {settings.db_path}")
     print(f"Storage mode: {settings.storage_mode}")
@@ -26,16 +74,26 @@ async def lifespan(app: FastAPI):
     # Initialize database
     await db.initialize()
     print("Database initialized")
+    checkpoint_task = asyncio.create_task(wal_checkpoint_loop())
 
     # Load settings
     user_settings = settings_manager.load()
     print(f"Settings loaded: {len(user_settings)} keys")
 
+    # Warm up connections to enabled remote sources in the background
+    source_urls = [c.base_url for c in await get_enabled_connectors() if c.base_url]
+    warmup_task = asyncio.create_task(warmup_http_client(source_urls))
+
     yield
 
     # Shutdown
     print("Shutting down...")
+    warmup_task.cancel()
+    checkpoint_task.cancel()
+    await close_http_client()
+    shutdown_parse_pool()
     await db.close()
+    log_listener.stop()
 
 
 # Create FastAPI app
@@ -43,7 +101,9 @@ app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="Local Law Update Tracker - API",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson for every endpoint; diff and search payloads carry large text arrays
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware (allow frontend to call API)
@@ -2,12 +2,15 @@
 Document parser for user-uploaded files
 Supports: PDF, DOCX, TXT, HTML
 """
+import mmap
 import re
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from io import BytesIO
+from typing import List, Optional, Dict, Any, BinaryIO, Union
 from pathlib import Path
 import chardet
 import magic
+import orjson
 
 # PDF parsing
 from PyPDF2 import PdfReader
@@ -42,6 +45,44 @@ class ParsedDocument:
     confidence_score: float = 1.0  # 0.0-1.0 extraction confidence
 
 
+def json_columns(parsed: ParsedDocument) -> Dict[str, Optional[str]]:
+    """
+    Serialize a parse result into its version table JSON columns
+
+    Returns outline_json, snippets_json, parse_warnings_json and page_map_json,
+    each None when the field is empty. Runs in the parse worker alongside the
+    parse itself.
+    """
+    def dumps(value: Any) -> Optional[str]:
+        if not value:
+            return None
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    return {
+        "outline_json": dumps([
+            {
+                "level": section.level,
+                "title": section.title,
+                "start_char": section.start_char,
+                "end_char": section.end_char,
+                "page": section.page
+            }
+            for section in parsed.outline
+        ]),
+        "snippets_json": dumps(parsed.snippets),
+        "parse_warnings_json": dumps(parsed.warnings),
+        "page_map_json": dumps(parsed.page_map)
+    }
+
+
+def _as_stream(file_bytes: Union[bytes, mmap.mmap]) -> BinaryIO:
+    """Seekable stream over the input; memory-mapped files are read in place"""
+    if isinstance(file_bytes, mmap.mmap):
+        file_bytes.seek(0)
+        return file_bytes
+    return BytesIO(file_bytes)
+
+
 class DocumentParser:
     """Main document parser class"""
 
@@ -88,12 +129,12 @@ class DocumentParser:
 
         raise ValueError(f"Unsupported file format: {mime_type} ({filename})")
 
-    def parse(self, file_bytes: bytes, filename: str, format_hint: Optional[str] = None) -> ParsedDocument:
+    def parse(self, file_bytes: Union[bytes, mmap.mmap], filename: str, format_hint: Optional[str] = None) -> ParsedDocument:
         """
         Parse a document and extract structured content
 
         Args:
-            file_bytes: File content as bytes
+            file_bytes: File content as bytes, or a read-only mmap of the file
             filename: Original filename
             format_hint: Optional format override ('pdf', 'docx', 'txt', 'html')
 
@@ -110,6 +151,11 @@ class DocumentParser:
         # Detect format
         doc_format = format_hint or self.detect_format(file_bytes, filename)
 
+        # PdfReader reads the mmap as a stream; the other formats need bytes
+        # (zipfile wants a seekable() method that mmap lacks before 3.13)
+        if isinstance(file_bytes, mmap.mmap) and doc_format != 'pdf':
+            file_bytes = file_bytes[:]
+
         # Parse based on format
         if doc_format == 'pdf':
             return self.parse_pdf(file_bytes)
@@ -124,13 +170,11 @@ class DocumentParser:
 
     def parse_pdf(self, file_bytes: bytes) -> ParsedDocument:
         """Parse PDF file"""
-        from io import BytesIO
-
         warnings = []
         metadata = {}
 
         try:
-            pdf = PdfReader(BytesIO(file_bytes))
+            pdf = PdfReader(_as_stream(file_bytes))
             metadata['pages'] = len(pdf.pages)
             metadata['format'] = 'pdf'
 
@@ -184,13 +228,11 @@ class DocumentParser:
 
     def parse_docx(self, file_bytes: bytes) -> ParsedDocument:
         """Parse DOCX file"""
-        from io import BytesIO
-
         warnings = []
         metadata = {'format': 'docx'}
 
         try:
-            doc = DocxDocument(BytesIO(file_bytes))
+            doc = DocxDocument(_as_stream(file_bytes))
 
             # Extract text from all paragraphs
             paragraphs = []
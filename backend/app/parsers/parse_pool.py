@@ -0,0 +1,101 @@
+"""
+Process pool for CPU-bound document parsing
+PDF/DOCX extraction runs in worker processes so the event loop stays free;
+citation extraction shares the same pool for large outlines
+"""
+import asyncio
+import mmap
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Tuple
+
+from .document_parser import DocumentParser, ParsedDocument, json_columns
+
+# A parse result plus its serialized JSON columns (see json_columns)
+PoolResult = Tuple[ParsedDocument, Dict[str, Optional[str]]]
+
+_pool: Optional[ProcessPoolExecutor] = None
+# Citation extraction reaches the pool from worker threads too
+_pool_lock = threading.Lock()
+
+# One parser per worker process (created on the worker's first job)
+_worker_parser: Optional[DocumentParser] = None
+
+
+def _parse_in_worker(source, filename: str, file_ext: str) -> PoolResult:
+    """
+    Worker entry point
+
+    source is either the file bytes or, for large files, a path the worker
+    memory-maps itself so the content is never pickled across processes.
+    The JSON columns are serialized here too, off the event loop.
+    """
+    global _worker_parser
+
+    if _worker_parser is None:
+        _worker_parser = DocumentParser()
+
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                parsed = _worker_parser.parse(mapped, filename, format_hint=file_ext)
+    else:
+        parsed = _worker_parser.parse(source, filename, format_hint=file_ext)
+
+    return parsed, json_columns(parsed)
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Get the shared pool, creating it on first use (or after shutdown)"""
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            # Spawned, not forked: the server process already runs threads
+            # (aiosqlite, the log listener) whose held locks a fork would copy
+            _pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+
+        return _pool
+
+
+def shutdown_parse_pool(broken: Optional[ProcessPoolExecutor] = None):
+    """
+    Stop the worker processes (app shutdown, or to replace a broken pool)
+
+    With broken given, the shared pool is only dropped if it is still that
+    pool, so a replacement another caller already created is left running.
+    """
+    global _pool
+
+    with _pool_lock:
+        if broken is not None and _pool is not broken:
+            return
+        pool, _pool = _pool, None
+
+    if pool is not None:
+        # A broken pool has no live workers to wait for
+        pool.shutdown(wait=broken is None, cancel_futures=True)
+
+
+async def parse_in_pool(source, filename: str, file_ext: str) -> PoolResult:
+    """
+    Parse and serialize a document (bytes, or a file path for large files) in the pool
+
+    If a worker died (OOM, a crash in a PDF/DOCX library), the pool is
+    replaced and the parse retried once on the new one.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_parse_pool()
+    try:
+        return await loop.run_in_executor(pool, _parse_in_worker, source, filename, file_ext)
+    except BrokenProcessPool:
+        shutdown_parse_pool(pool)
+        return await loop.run_in_executor(
+            get_parse_pool(), _parse_in_worker, source, filename, file_ext
+        )
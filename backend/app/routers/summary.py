@@ -1,6 +1,7 @@
 """
 Plain-language summary API endpoints
 """
+import asyncio
 from fastapi import APIRouter, HTTPException, Path
 from pydantic import BaseModel
 from typing import Dict, Any, Optional, List
@@ -80,7 +81,9 @@ async def summarize_document(request: SummarizeRequest) -> Dict[str, Any]:
         confidence_reasons = []
 
         if version.get("is_user_uploaded"):
-            citations, citation_confidence = citation_extractor.extract_upload_citations(
+            # CPU-bound (and may wait on worker processes); keep it off the event loop
+            citations, citation_confidence = await asyncio.to_thread(
+                citation_extractor.extract_upload_citations,
                 version_data=dict(version),
                 doc_id=version["doc_id"],
                 version_id=request.version_id
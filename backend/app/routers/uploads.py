@@ -210,13 +210,7 @@ async def upload_document(
 
         # Insert document
         await db.execute(
-            """
-            INSERT INTO document (
-                id, source_id, jurisdiction, doc_type, title,
-                identifiers_json, canonical_url, first_seen_ts, last_seen_ts,
-                is_user_uploaded, original_filename, upload_mime, source_path
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+            db.DOCUMENT_INSERT_SQL,
             (
                 doc_id,
                 "user_uploads",
@@ -612,6 +606,12 @@ async def delete_upload(
             (doc_id,)
         )
 
+        # Delete remote id mapping
+        await db.execute(
+            "DELETE FROM document_remote_id WHERE document_id = ?",
+            (doc_id,)
+        )
+
         # Delete document
         await db.execute(
             "DELETE FROM document WHERE id = ?",
@@ -794,6 +794,12 @@ async def clear_all_uploads(confirm: bool = Query(..., description="Must be true
         deleted_count = len(uploads)
 
         # Delete from database (cascade will delete versions, FTS entries)
+        await db.execute(
+            """
+            DELETE FROM document_remote_id
+            WHERE document_id IN (SELECT id FROM document WHERE is_user_uploaded = 1)
+            """
+        )
         await db.execute(
             "DELETE FROM document WHERE is_user_uploaded = 1"
         )
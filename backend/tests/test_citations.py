@@ -92,6 +92,61 @@ Either party may terminate with 30 days notice."""
         if match_method == "fuzzy":
             assert verified is True
 
+    def test_fuzzy_match_returns_absolute_offsets(self):
+        """Test fuzzy match offsets are relative to the full document"""
+        original = "Either party may terminate with 30 days notice."
+        quote = "Either party may terminete with 30 day notice."
+        start = self.sample_text.find(original)
+
+        verified, match_method, actual_start, actual_end = self.extractor._fuzzy_match_span(
+            quote_text=quote,
+            full_text=self.sample_text,
+            claimed_start=start,
+            claimed_end=start + len(quote)
+        )
+
+        assert verified is True
+        assert match_method == "fuzzy"
+        assert abs(actual_start - start) <= 2
+        assert "terminate" in self.sample_text[actual_start:actual_end]
+
+    def test_fuzzy_match_without_rapidfuzz(self, monkeypatch):
+        """Test the difflib fallback finds the same fuzzy span"""
+        import app.analysis.citations as citations_module
+        monkeypatch.setattr(citations_module, "fuzz", None)
+
+        original = "Either party may terminate with 30 days notice."
+        quote = "Either party may terminete with 30 day notice."
+        start = self.sample_text.find(original)
+
+        verified, match_method, actual_start, actual_end = self.extractor._fuzzy_match_span(
+            quote_text=quote,
+            full_text=self.sample_text,
+            claimed_start=start + 40,
+            claimed_end=start + 40 + len(quote)
+        )
+
+        assert verified is True
+        assert match_method == "fuzzy"
+        assert "terminate" in self.sample_text[actual_start:actual_end]
+
+    def test_trusted_span_locates_stripped_quote(self):
+        """Test self-sliced spans resolve to the stripped quote inside the span"""
+        quote = "The premises are located at 123 Main Street."
+        start = self.sample_text.find(quote)
+
+        verified, match_method, actual_start, actual_end = self.extractor.verify_citation_span(
+            quote_text=quote,
+            full_text=self.sample_text,
+            claimed_start=start - 1,
+            claimed_end=start + len(quote) + 2,
+            trust_span=True
+        )
+
+        assert verified is True
+        assert match_method == "exact"
+        assert (actual_start, actual_end) == (start, start + len(quote))
+
     def test_no_match_found(self):
         """Test when citation cannot be verified"""
         quote = "This text does not exist in the document at all."
@@ -201,6 +256,73 @@ class TestConfidenceScoring:
         assert conf1 == conf2
         assert reasons1 == reasons2
 
+    def test_parser_weight_ignores_mime_parameters(self):
+        """Test parser weight lookup normalizes case and MIME parameters"""
+        assert self.extractor._parser_weight("text/plain") == 1.0
+        assert self.extractor._parser_weight("Text/HTML; charset=utf-8") == 0.95
+        assert self.extractor._parser_weight("application/x-unknown") == 0.5
+        assert self.extractor._parser_weight(None) == 0.5
+
+    def test_reasons_skipped_when_explain_disabled(self):
+        """Test explain=False keeps scores but skips reason strings"""
+        quiet = CitationExtractor(explain=False)
+        kwargs = dict(
+            text="This is a sufficiently long citation text.",
+            section_title="Important Section",
+            page_num=3,
+            verified=True,
+            match_method="exact",
+            mime_type="text/plain"
+        )
+
+        conf_quiet, reasons_quiet = quiet._calculate_citation_confidence(**kwargs)
+        conf_full, reasons_full = self.extractor._calculate_citation_confidence(**kwargs)
+
+        assert conf_quiet == conf_full
+        assert reasons_quiet == []
+        assert len(reasons_full) > 0
+
+    def test_memoized_score_keeps_specific_reasons(self):
+        """Test cached scores are shared while reasons still quote each citation"""
+        conf_a, reasons_a = self.extractor._calculate_citation_confidence(
+            text="First sufficiently long citation.",
+            section_title="Section A",
+            page_num=1,
+            verified=True,
+            match_method="exact",
+            mime_type="application/pdf"
+        )
+        conf_b, reasons_b = self.extractor._calculate_citation_confidence(
+            text="Second sufficiently long citation text.",
+            section_title="Section B",
+            page_num=7,
+            verified=True,
+            match_method="exact",
+            mime_type="application/pdf"
+        )
+
+        assert conf_a == conf_b
+        assert "Section heading available: 'Section A'" in reasons_a
+        assert "Page number available: 7" in reasons_b
+
+    def test_explain_citation_on_demand(self):
+        """Test reasons can be re-derived for a citation extracted without them"""
+        quiet = CitationExtractor(explain=False)
+        text = "Section 1. Scope\nThis agreement covers all services provided."
+        citations, _ = quiet.extract_citations(
+            text=text,
+            outline=[{"title": "Section 1. Scope", "start_char": 0, "end_char": len(text)}],
+            page_map=None,
+            doc_id="doc1",
+            version_id="v1",
+            mime_type="text/plain"
+        )
+
+        assert citations[0].confidence_reasons == []
+        reasons = quiet.explain_citation(citations[0], mime_type="text/plain")
+        assert "Citation verified in source text" in reasons
+        assert any("Section heading available" in r for r in reasons)
+
     def test_all_factors_contribute(self):
         """Test that all confidence factors contribute"""
         # Test with all positive factors
@@ -327,6 +449,101 @@ We collect and use your data as described in our privacy policy."""
         assert citations[0].verified is True
 
 
+    def test_parallel_extraction_matches_serial(self):
+        """Test process-pool extraction returns the same citations in order"""
+        sections = [f"Section {i}. Clause number {i} applies here." for i in range(40)]
+        text = "\n".join(sections)
+        outline = []
+        pos = 0
+        for title in sections:
+            outline.append({"title": title[:10], "start_char": pos, "end_char": pos + len(title)})
+            pos += len(title) + 1
+
+        extractor = CitationExtractor()
+        extractor.PARALLEL_MIN_SECTIONS = 16
+
+        serial, serial_conf = extractor.extract_citations(
+            text, outline, None, "doc1", "v1", mime_type="text/plain", max_workers=1
+        )
+        parallel, parallel_conf = extractor.extract_citations(
+            text, outline, None, "doc1", "v1", mime_type="text/plain", max_workers=2
+        )
+
+        assert [c.to_dict() for c in parallel] == [c.to_dict() for c in serial]
+        assert parallel_conf == serial_conf
+
+    def test_iter_citations_accumulates_confidence(self):
+        """Test streamed citations and running confidence match extract_citations"""
+        from app.analysis.citations import _ConfidenceAccumulator
+
+        text = "Section 1. Scope\nThis agreement covers all services.\nSection 2. Term\nIt lasts one year."
+        outline = [
+            {"title": "Section 1. Scope", "start_char": 0, "end_char": 52},
+            {"title": "Section 2. Term", "start_char": 53, "end_char": len(text)}
+        ]
+
+        citations, confidence = self.extractor.extract_citations(
+            text, outline, None, "doc1", "v1", mime_type="text/plain"
+        )
+
+        accumulator = _ConfidenceAccumulator()
+        streamed = list(self.extractor.iter_citations(
+            text, outline, None, "doc1", "v1", mime_type="text/plain", accumulator=accumulator
+        ))
+
+        assert [c.to_dict() for c in streamed] == [c.to_dict() for c in citations]
+        assert accumulator.count == len(citations)
+        assert accumulator.overall(1.0) == confidence
+
+    def test_extract_upload_citations_parses_json_columns(self):
+        """Test upload citation extraction from stored version columns"""
+        text = "Section 1. Scope\nThis agreement covers all services provided."
+        version_data = {
+            "normalized_text": text,
+            "outline_json": '[{"title": "Section 1. Scope", "start_char": 0, "end_char": %d, "page": 1}]' % len(text),
+            "page_map_json": b'{"1": {"start_char": 0, "end_char": 61}}',
+            "upload_mime": "application/pdf"
+        }
+
+        citations, confidence = self.extractor.extract_upload_citations(
+            version_data=version_data,
+            doc_id="doc1",
+            version_id="v1"
+        )
+
+        assert len(citations) == 1
+        assert citations[0].location.page == 1
+        assert citations[0].verified is True
+        assert confidence > 0.5
+
+
+class TestCitationSpans:
+    """Test span lookup used for UI highlighting"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.extractor = CitationExtractor()
+        self.text = "Rent is due monthly. Late rent incurs a fee. RENT may increase yearly."
+
+    def test_batch_matches_single_query_results(self):
+        """Test batch lookup returns the same spans as per-query lookup"""
+        queries = ["rent", "fee", "yearly", "missing"]
+
+        batch = self.extractor.find_citation_spans_batch(self.text, queries)
+
+        for query in queries:
+            assert batch[query] == self.extractor.find_citation_spans(self.text, query)
+        assert len(batch["rent"]) == 3
+        assert batch["missing"] == []
+
+    def test_batch_ignores_empty_queries(self):
+        """Test empty queries return no spans"""
+        batch = self.extractor.find_citation_spans_batch(self.text, ["", "fee"])
+
+        assert batch[""] == []
+        assert len(batch["fee"]) == 1
+
+
 class TestCitationDataclass:
     """Test Citation dataclass functionality"""
 
@@ -363,6 +580,32 @@ class TestCitationDataclass:
         assert result["location"]["section"] == "Test Section"
         assert result["location"]["page"] == 5
 
+    def test_location_to_dict_omits_none(self):
+        """Test CitationLocation.to_dict() drops unset fields"""
+        location = CitationLocation(section=None, char_start=0, char_end=12)
+
+        assert location.to_dict() == {"char_start": 0, "char_end": 12}
+
+    def test_citations_to_json_matches_to_dict(self):
+        """Test orjson export keeps the to_dict() shape"""
+        import json
+        from app.analysis.citations import citations_to_json
+
+        citation = Citation(
+            doc_id="doc1",
+            version_id="v1",
+            citation_type="user_upload",
+            text="Sample citation text",
+            location=CitationLocation(section="Intro", char_start=0, char_end=20),
+            confidence=0.9,
+            verified=True
+        )
+
+        assert json.loads(citation.to_json_bytes()) == citation.to_dict()
+        assert json.loads(citations_to_json({"citations": [citation]})) == {
+            "citations": [citation.to_dict()]
+        }
+
 
 if __name__ == "__main__":
     # Run tests with pytest
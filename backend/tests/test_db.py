@@ -152,3 +152,93 @@ async def test_fts_search(temp_db):
 
     assert len(results) > 0
     assert "Climate" in results[0]["title"]
+
+
+@pytest.mark.asyncio
+async def test_pooled_reads(temp_db):
+    """Test reads run on the read-only pool and see committed writes"""
+    import asyncio
+
+    await temp_db.execute(
+        "INSERT INTO source (id, name) VALUES (?, ?)",
+        ("test_source", "Test Source")
+    )
+
+    # More concurrent reads than pooled connections
+    results = await asyncio.gather(*(
+        temp_db.fetch_one("SELECT name FROM source WHERE id = ?", ("test_source",))
+        for _ in range(Database.READ_POOL_SIZE * 3)
+    ))
+    assert all(row["name"] == "Test Source" for row in results)
+
+    # Pooled connections reject writes
+    async with temp_db._reader() as conn:
+        with pytest.raises(Exception):
+            await conn.execute("DELETE FROM source")
+
+
+@pytest.mark.asyncio
+async def test_execute_waits_for_open_transaction(temp_db):
+    """Test a write from another task is not rolled back with a failed transaction"""
+    import asyncio
+
+    started = asyncio.Event()
+
+    async def failing_transaction():
+        async with temp_db.transaction():
+            await temp_db.execute(
+                "INSERT INTO source (id, name) VALUES (?, ?)",
+                ("rolled_back", "Rolled Back")
+            )
+            started.set()
+            await asyncio.sleep(0.05)
+            raise RuntimeError("sync failed")
+
+    async def other_write():
+        await started.wait()
+        await temp_db.execute(
+            "INSERT INTO source (id, name) VALUES (?, ?)",
+            ("kept", "Kept")
+        )
+
+    results = await asyncio.gather(
+        failing_transaction(), other_write(), return_exceptions=True
+    )
+    assert isinstance(results[0], RuntimeError)
+
+    assert await temp_db.fetch_one("SELECT id FROM source WHERE id = ?", ("kept",))
+    assert await temp_db.fetch_one("SELECT id FROM source WHERE id = ?", ("rolled_back",)) is None
+
+
+@pytest.mark.asyncio
+async def test_remote_id_backfill(temp_db):
+    """Test migration 007 maps documents synced before document_remote_id existed"""
+    documents = [
+        ("doc-bill", "congress_gov", '{"congress": 118, "bill_type": "HR", "bill_number": "42"}'),
+        ("doc-rule", "federal_register", '{"document_number": "2024-00001", "executive_order_number": 14100}'),
+        ("doc-opinion", "scotus", '{"case_number": "22-1234"}'),
+        ("doc-upload", "user_uploads", '{"filename": "notes.txt"}'),
+    ]
+    await temp_db.execute(
+        "INSERT OR IGNORE INTO source (id, name) VALUES ('user_uploads', 'User Uploads')"
+    )
+    for doc_id, source_id, identifiers_json in documents:
+        await temp_db.execute(
+            """
+            INSERT INTO document (id, source_id, title, identifiers_json, first_seen_ts, last_seen_ts)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (doc_id, source_id, doc_id, identifiers_json, "2024-01-01", "2024-01-01")
+        )
+
+    conn = await temp_db.connect()
+    await conn.executescript(temp_db._migration_007_backfill_document_remote_id())
+
+    rows = await temp_db.fetch_all(
+        "SELECT source_id, remote_id, document_id FROM document_remote_id ORDER BY document_id"
+    )
+    assert [(r["source_id"], r["remote_id"], r["document_id"]) for r in rows] == [
+        ("congress_gov", "118-HR-42", "doc-bill"),
+        ("scotus", "22-1234", "doc-opinion"),
+        ("federal_register", "2024-00001", "doc-rule"),
+    ]
@@ -0,0 +1,39 @@
+"""
+Diff engine tests
+"""
+import difflib
+import random
+
+import pytest
+
+from app.diff_engine import _unified_diff
+
+
+CASES = [
+    ([], []),
+    ([], ["added one", "added two"]),
+    (["removed one", "removed two"], []),
+    (["same", "lines"], ["same", "lines"]),
+    (["a", "b", "c", "d"], ["a", "B", "c", "d", "e"]),
+    ([f"line {i}" for i in range(40)], [f"line {i}" for i in range(40) if i not in (3, 20, 21)]),
+    (["only"], ["changed"]),
+]
+
+
+@pytest.mark.parametrize("n", [0, 1, 3])
+@pytest.mark.parametrize("a,b", CASES)
+def test_unified_diff_matches_difflib(a, b, n):
+    """Test hunk headers and lines match difflib.unified_diff, including n=0 and empty sides"""
+    assert list(_unified_diff(a, b, n)) == list(difflib.unified_diff(a, b, lineterm='', n=n))
+
+
+def test_unified_diff_matches_difflib_random():
+    """Test random edits against difflib.unified_diff"""
+    rng = random.Random(1234)
+    vocabulary = [f"line {i}" for i in range(12)]
+
+    for _ in range(300):
+        a = [rng.choice(vocabulary) for _ in range(rng.randint(0, 30))]
+        b = [rng.choice(vocabulary) for _ in range(rng.randint(0, 30))]
+        n = rng.randint(0, 4)
+        assert list(_unified_diff(a, b, n)) == list(difflib.unified_diff(a, b, lineterm='', n=n))
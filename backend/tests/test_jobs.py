@@ -0,0 +1,60 @@
+"""
+Job manager tests
+"""
+import asyncio
+
+import pytest
+
+import app.connectors
+from app.jobs import JobManager, JobStatus
+
+
+class BlockingConnector:
+    """Connector whose sync waits until released"""
+
+    source_id = "blocking"
+
+    def __init__(self, release: asyncio.Event):
+        self.release = release
+
+    async def sync(self, progress_callback=None):
+        await self.release.wait()
+
+
+@pytest.mark.asyncio
+async def test_job_history_is_capped(monkeypatch):
+    """Test old finished jobs are evicted while running and latest jobs are kept"""
+    release = asyncio.Event()
+    connectors = [BlockingConnector(release)]
+
+    async def get_enabled_connectors():
+        return list(connectors)
+
+    monkeypatch.setattr(app.connectors, "get_enabled_connectors", get_enabled_connectors)
+
+    manager = JobManager()
+    manager.MAX_JOBS = 3
+    assert await manager.get_latest_job_status() is None
+
+    # Oldest job stays running for the whole test
+    running_id = await manager.create_sync_job()
+    await asyncio.sleep(0)
+    assert manager.jobs[running_id].status == JobStatus.RUNNING
+
+    # More finished jobs than MAX_JOBS
+    connectors.clear()
+    finished_ids = []
+    for _ in range(5):
+        job_id = await manager.create_sync_job()
+        await manager.jobs[job_id].task
+        finished_ids.append(job_id)
+
+    assert list(manager.jobs) == [running_id, *finished_ids[-2:]]
+
+    latest = await manager.get_latest_job_status()
+    assert latest["id"] == finished_ids[-1]
+    assert latest["status"] == JobStatus.COMPLETED.value
+
+    release.set()
+    await manager.jobs[running_id].task
+    assert manager.jobs[running_id].status == JobStatus.COMPLETED
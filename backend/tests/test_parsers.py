@@ -82,3 +82,22 @@ def test_parse_html():
     assert "headings" in result
     assert result["metadata"]["title"] == "Test Document"
     assert len(result["headings"]) >= 2
+
+
+@pytest.mark.asyncio
+async def test_parse_pool_recovers_from_dead_worker():
+    """Test a broken parse pool is replaced instead of failing every later parse"""
+    import os
+    from concurrent.futures.process import BrokenProcessPool
+    from app.parsers.parse_pool import get_parse_pool, parse_in_pool, shutdown_parse_pool
+
+    broken = get_parse_pool()
+    with pytest.raises(BrokenProcessPool):
+        broken.submit(os._exit, 1).result()
+
+    try:
+        parsed, columns = await parse_in_pool(b"Plain text upload for the pool.", "a.txt", "txt")
+        assert "Plain text upload" in parsed.text
+        assert get_parse_pool() is not broken
+    finally:
+        shutdown_parse_pool()
@@ -0,0 +1,99 @@
+"""
+Policy analyzer tests
+"""
+from app.analysis import policy_analyzer
+from app.analysis.policy_analyzer import (
+    DataRightIssue,
+    analyze_policy,
+    deduplicate_by_position,
+    detect_power_imbalances,
+    detect_data_issues,
+    detect_consumer_red_flags,
+    generate_policy_summary,
+    scan_keyword_sentences,
+)
+
+
+SAMPLE_POLICY = (
+    "Welcome to the Service. We reserve the right to modify these terms at our sole discretion. "
+    "The Service is provided AS IS with no warranty! We collect cookies and tracking data. "
+    "We may share with third parties and partners? Subscriptions automatically renew unless cancelled. "
+    "All fees are non-refundable. You agree to indemnify and hold us harmless."
+)
+
+
+def test_keyword_sentence_span():
+    """Test keyword hits expand to their enclosing sentence"""
+    imbalances = detect_power_imbalances(SAMPLE_POLICY)
+
+    sentence = "We reserve the right to modify these terms at our sole discretion."
+    start = SAMPLE_POLICY.find(sentence)
+    spans = [(i.start_char, i.end_char) for i in imbalances]
+
+    # Span starts right after the previous terminator (leading space included)
+    assert (start - 1, start + len(sentence)) in spans
+    assert any(i.citation_text == sentence for i in imbalances)
+
+
+def test_keyword_too_far_from_terminator():
+    """Test hits more than 200 chars before a terminator are not cited"""
+    text = "You grant us " + "x" * 250 + "."
+
+    assert detect_power_imbalances(text) == []
+
+
+def test_regex_fallback_matches_automaton(monkeypatch):
+    """Test the per-keyword regex path finds the same spans"""
+    text = SAMPLE_POLICY + " " + "y" * 150 + " sell your data " + "z" * 150 + "."
+    with_automaton = scan_keyword_sentences(text)
+
+    monkeypatch.setattr(policy_analyzer, "_KEYWORD_AUTOMATON", None)
+    with_regex = scan_keyword_sentences(text)
+
+    assert with_regex == with_automaton
+
+
+def test_analyze_policy_matches_detectors():
+    """Test the fused pass agrees with standalone detector calls"""
+    imbalances, data_issues, red_flags = analyze_policy(SAMPLE_POLICY)
+
+    assert imbalances == detect_power_imbalances(SAMPLE_POLICY)
+    assert data_issues == detect_data_issues(SAMPLE_POLICY)
+    assert red_flags == detect_consumer_red_flags(SAMPLE_POLICY)
+
+    summary = generate_policy_summary(SAMPLE_POLICY, "Terms of Service")
+    assert summary["power_imbalances"]["total"] == len(imbalances)
+    assert summary["consumer_red_flags"]["total"] == len(red_flags) > 0
+
+
+def test_lowercase_keeps_offsets():
+    """Test spans stay aligned when lowercasing would lengthen the text"""
+    text = "İstanbul office. We reserve the right to modify these terms."
+    imbalances = detect_power_imbalances(text)
+
+    assert len(imbalances) == 1
+    assert imbalances[0].citation_text == "We reserve the right to modify these terms."
+    assert text[imbalances[0].start_char:imbalances[0].end_char].strip() == imbalances[0].citation_text
+
+
+def test_deduplicate_against_furthest_span():
+    """Test dedup compares with the furthest-reaching kept span, not just the last one"""
+    outer = DataRightIssue("collection", "outer", "none", "a", 0, 300)
+    short = DataRightIssue("collection", "short", "none", "b", 100, 120)
+    nested = DataRightIssue("collection", "nested", "none", "c", 200, 290)
+    later = DataRightIssue("collection", "later", "none", "d", 280, 400)
+
+    deduped = deduplicate_by_position([later, nested, short, outer])
+
+    assert [d.description for d in deduped] == ["outer", "short", "later"]
+    assert deduplicate_by_position([outer, short, nested, later], already_sorted=True) == deduped
+
+
+def test_one_hit_per_category_sentence():
+    """Test several keywords of one category in a sentence cite it once"""
+    text = "Plans automatically renew as a continuous subscription unless cancelled."
+
+    red_flags = detect_consumer_red_flags(text)
+
+    assert [flag["type"] for flag in red_flags] == ["auto_renewal"]
+    assert red_flags[0]["text"] == text